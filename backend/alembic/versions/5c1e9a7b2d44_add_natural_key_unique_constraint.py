@@ -0,0 +1,43 @@
+"""Add natural key unique constraint to transactions
+
+Revision ID: 5c1e9a7b2d44
+Revises: 12ff1455323e
+Create Date: 2026-10-17 09:12:41.208113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e9a7b2d44'
+down_revision: Union[str, Sequence[str], None] = '12ff1455323e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing duplicates would block the constraint; keep the oldest row of each group.
+    op.execute(
+        """
+        DELETE FROM transactions t
+        USING transactions d
+        WHERE t.details = d.details
+          AND t.amount = d.amount
+          AND t.transaction_date = d.transaction_date
+          AND t.id > d.id
+        """
+    )
+    op.create_unique_constraint(
+        'uq_transactions_natural_key',
+        'transactions',
+        ['details', 'amount', 'transaction_date'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_transactions_natural_key', 'transactions', type_='unique')
@@ -0,0 +1,42 @@
+"""create ingest_jobs table
+
+Revision ID: 9a3f6d2e8c15
+Revises: 5c1e9a7b2d44
+Create Date: 2026-10-17 10:02:17.530941
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a3f6d2e8c15'
+down_revision: Union[str, Sequence[str], None] = '5c1e9a7b2d44'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('ingest_jobs',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('file_id', sa.String(), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('rows_processed', sa.Integer(), nullable=False),
+    sa.Column('rows_stored', sa.Integer(), nullable=False),
+    sa.Column('rows_added', sa.Integer(), nullable=False),
+    sa.Column('rows_skipped', sa.Integer(), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_ingest_jobs_file_id'), 'ingest_jobs', ['file_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_ingest_jobs_file_id'), table_name='ingest_jobs')
+    op.drop_table('ingest_jobs')
@@ -0,0 +1,35 @@
+"""Add keyset pagination indexes
+
+Revision ID: a6c9e2f4d1b7
+Revises: f2b5d8a0c7e3
+Create Date: 2026-10-17 12:36:49.215870
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6c9e2f4d1b7'
+down_revision: Union[str, Sequence[str], None] = 'f2b5d8a0c7e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # (file_id, transaction_date, id) covers everything idx_file_date did
+    op.create_index('idx_file_date_id', 'transactions', ['file_id', 'transaction_date', 'id'], unique=False)
+    op.drop_index('idx_file_date', table_name='transactions')
+    op.create_index('idx_date_id', 'transactions', ['transaction_date', 'id'], unique=False)
+    op.create_index('idx_category_date_id', 'transactions', ['category', 'transaction_date', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_category_date_id', table_name='transactions')
+    op.drop_index('idx_date_id', table_name='transactions')
+    op.create_index('idx_file_date', 'transactions', ['file_id', 'transaction_date'], unique=False)
+    op.drop_index('idx_file_date_id', table_name='transactions')
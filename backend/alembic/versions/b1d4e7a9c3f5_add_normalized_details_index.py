@@ -0,0 +1,29 @@
+"""Add normalized details index for category corrections
+
+Revision ID: b1d4e7a9c3f5
+Revises: d8f1b3a6e5c2
+Create Date: 2026-10-17 14:02:55.630971
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b1d4e7a9c3f5'
+down_revision: Union[str, Sequence[str], None] = 'd8f1b3a6e5c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Corrections match on lower(trim(details)), across every file when propagated
+    op.create_index('idx_details_normalized', 'transactions', [sa.text('lower(trim(details))')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_details_normalized', table_name='transactions')
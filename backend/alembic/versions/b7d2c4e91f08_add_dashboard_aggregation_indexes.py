@@ -0,0 +1,30 @@
+"""Add dashboard aggregation indexes
+
+Revision ID: b7d2c4e91f08
+Revises: 9a3f6d2e8c15
+Create Date: 2026-10-17 10:41:55.086312
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2c4e91f08'
+down_revision: Union[str, Sequence[str], None] = '9a3f6d2e8c15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('idx_file_date', 'transactions', ['file_id', 'transaction_date'], unique=False)
+    op.create_index('idx_file_id_category', 'transactions', ['file_id', 'category'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_file_id_category', table_name='transactions')
+    op.drop_index('idx_file_date', table_name='transactions')
@@ -0,0 +1,40 @@
+"""Add full-text and trigram search on transaction details
+
+Revision ID: c3e7a9b5f2d6
+Revises: a6c9e2f4d1b7
+Create Date: 2026-10-17 13:08:12.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e7a9b5f2d6'
+down_revision: Union[str, Sequence[str], None] = 'a6c9e2f4d1b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Generated column: Postgres keeps it in step with details on every insert/update
+    op.execute(
+        """
+        ALTER TABLE transactions
+        ADD COLUMN details_tsv tsvector
+        GENERATED ALWAYS AS (to_tsvector('simple', coalesce(details, ''))) STORED
+        """
+    )
+    op.execute("CREATE INDEX idx_transactions_details_tsv ON transactions USING GIN (details_tsv)")
+    op.execute("CREATE INDEX idx_transactions_details_trgm ON transactions USING GIN (details gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_transactions_details_trgm', table_name='transactions')
+    op.drop_index('idx_transactions_details_tsv', table_name='transactions')
+    op.drop_column('transactions', 'details_tsv')
@@ -0,0 +1,53 @@
+"""create category_memory table
+
+Revision ID: d8f1b3a6e5c2
+Revises: c3e7a9b5f2d6
+Create Date: 2026-10-17 13:41:27.118305
+
+"""
+import json
+import os
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8f1b3a6e5c2'
+down_revision: Union[str, Sequence[str], None] = 'c3e7a9b5f2d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MEMORY_MAP_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'assets', 'memory_map.json')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    memory = op.create_table('category_memory',
+    sa.Column('detail', sa.String(length=255), nullable=False),
+    sa.Column('category', sa.String(length=50), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('detail')
+    )
+    op.create_index(op.f('ix_category_memory_updated_at'), 'category_memory', ['updated_at'], unique=False)
+
+    # Seed from the JSON file the app used to rewrite on every correction
+    if os.path.exists(MEMORY_MAP_PATH):
+        with open(MEMORY_MAP_PATH, 'r', encoding='utf-8') as f:
+            memory_map = json.load(f)
+        now = datetime.utcnow()
+        rows = {}
+        for detail, category in memory_map.items():
+            detail = str(detail).strip().lower()[:255]
+            if detail and category:
+                rows[detail] = {'detail': detail, 'category': str(category).strip()[:50], 'updated_at': now}
+        if rows:
+            op.bulk_insert(memory, list(rows.values()))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_category_memory_updated_at'), table_name='category_memory')
+    op.drop_table('category_memory')
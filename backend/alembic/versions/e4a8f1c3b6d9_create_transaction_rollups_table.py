@@ -0,0 +1,55 @@
+"""create transaction_rollups table
+
+Revision ID: e4a8f1c3b6d9
+Revises: b7d2c4e91f08
+Create Date: 2026-10-17 11:20:33.671245
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a8f1c3b6d9'
+down_revision: Union[str, Sequence[str], None] = 'b7d2c4e91f08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('transaction_rollups',
+    sa.Column('file_id', sa.String(), nullable=False),
+    sa.Column('month', sa.String(length=7), nullable=False),
+    sa.Column('category', sa.String(length=50), nullable=False),
+    sa.Column('income_total', sa.Float(), nullable=False),
+    sa.Column('income_count', sa.Integer(), nullable=False),
+    sa.Column('spend_total', sa.Float(), nullable=False),
+    sa.Column('spend_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('file_id', 'month', 'category')
+    )
+    # Backfill from existing transactions
+    op.execute(
+        """
+        INSERT INTO transaction_rollups
+            (file_id, month, category, income_total, income_count, spend_total, spend_count)
+        SELECT
+            file_id,
+            to_char(transaction_date, 'YYYY-MM'),
+            COALESCE(category, 'Uncategorized'),
+            COALESCE(SUM(CASE WHEN amount > 0 THEN amount ELSE 0 END), 0),
+            COUNT(CASE WHEN amount > 0 THEN 1 END),
+            COALESCE(SUM(CASE WHEN amount < 0 THEN -amount ELSE 0 END), 0),
+            COUNT(CASE WHEN amount < 0 THEN 1 END)
+        FROM transactions
+        WHERE file_id IS NOT NULL AND transaction_date IS NOT NULL
+        GROUP BY file_id, to_char(transaction_date, 'YYYY-MM'), COALESCE(category, 'Uncategorized')
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('transaction_rollups')
@@ -0,0 +1,42 @@
+"""create uploaded_files table
+
+Revision ID: f2b5d8a0c7e3
+Revises: e4a8f1c3b6d9
+Create Date: 2026-10-17 11:58:06.442190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b5d8a0c7e3'
+down_revision: Union[str, Sequence[str], None] = 'e4a8f1c3b6d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('uploaded_files',
+    sa.Column('file_hash', sa.String(length=32), nullable=False),
+    sa.Column('file_id', sa.String(), nullable=False),
+    sa.Column('size_bytes', sa.Integer(), nullable=False),
+    sa.Column('rows_processed', sa.Integer(), nullable=False),
+    sa.Column('rows_stored', sa.Integer(), nullable=False),
+    sa.Column('rows_added', sa.Integer(), nullable=False),
+    sa.Column('rows_skipped', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('file_hash')
+    )
+    op.create_index(op.f('ix_uploaded_files_file_id'), 'uploaded_files', ['file_id'], unique=False)
+    op.create_index(op.f('ix_transactions_file_hash'), 'transactions', ['file_hash'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_transactions_file_hash'), table_name='transactions')
+    op.drop_index(op.f('ix_uploaded_files_file_id'), table_name='uploaded_files')
+    op.drop_table('uploaded_files')
@@ -0,0 +1,152 @@
+# backend/benchmarks/generator.py
+#
+# Deterministic synthetic mobile-money statements in the layout our bank
+# exports use, for benchmarking the ingest pipeline:
+#
+#     python -m backend.benchmarks.generator --rows 1000000 --out /tmp/statement.csv
+
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+ASSETS_DIR = os.path.join(os.path.dirname(__file__), "..", "assets")
+
+MIN_ROWS = 1_000
+MAX_ROWS = 5_000_000
+CHUNK_ROWS = 100_000
+
+COLUMNS = ["Date", "Time", "Transaction Type", "Details", "Reference", "Amount (MWK)", "Balance"]
+
+# (type, reference prefix, sign of the amount)
+TRANSACTION_TYPES = [
+    ("Money Sent", "MP", -1),
+    ("Money Withdrawn", "CO", -1),
+    ("Airtime Purchased", "AT", -1),
+    ("Money Deposit", "C1", 1),
+]
+TYPE_WEIGHTS = [0.5, 0.2, 0.1, 0.2]
+
+# Merchants nobody has categorized yet, so the ML model has to handle them
+FIRST_NAMES = ["CHIKONDI", "TIWONGE", "MPHATSO", "KONDWANI", "THOKOZANI", "LIMBANI",
+               "TAONGA", "CHISOMO", "DALITSO", "YAMIKANI", "PILIRANI", "LUSUNGU"]
+SURNAMES = ["BANDA", "PHIRI", "MWALE", "CHIRWA", "NKHOMA", "GONDWE", "KAUNDA",
+            "MVULA", "NYIRENDA", "MBEWE", "JERE", "KUMWENDA"]
+PLACES = ["LILONGWE", "BLANTYRE", "MZUZU", "ZOMBA", "KASUNGU", "MANGOCHI"]
+
+# Share of rows whose details come from each source
+MERCHANT_MIX = {"memory": 0.3, "keyword": 0.3, "unknown": 0.4}
+
+# Share of rows written in the messier forms real exports contain
+COMMA_AMOUNTS = 0.05     # "12,500" instead of 12500
+TWENTY_FOUR_HOUR = 0.10  # "17:42 PM", parsed by a fallback format
+LONG_YEAR = 0.02         # "13/06/2025 17:42"
+UNPARSEABLE = 0.01       # rows ingest drops
+
+
+def _load_json(name: str) -> dict:
+    with open(os.path.join(ASSETS_DIR, name), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def merchant_pool(seed: int = 0, unknown: int = 2000) -> dict:
+    """Details strings by source: memory-map hits, keyword hits and unknown names."""
+    rng = np.random.default_rng(seed)
+    memory = [detail.upper() for detail in _load_json("memory_map.json")]
+    keywords = [
+        f"{keyword.upper()} {place}"
+        for keyword in _load_json("category_keywords.json")
+        for place in PLACES
+    ]
+    names = {
+        f"{rng.choice(FIRST_NAMES)} {rng.choice(SURNAMES)} {rng.integers(100, 999)}"
+        for _ in range(unknown)
+    }
+    return {"memory": memory, "keyword": keywords, "unknown": sorted(names)}
+
+
+def _chunk(rng, n: int, pool: dict, start_minute: int, balance: float) -> tuple:
+    sources = list(MERCHANT_MIX)
+    source = rng.choice(len(sources), size=n, p=list(MERCHANT_MIX.values()))
+    details = np.empty(n, dtype=object)
+    for i, name in enumerate(sources):
+        picks = source == i
+        details[picks] = np.asarray(pool[name], dtype=object)[rng.integers(0, len(pool[name]), picks.sum())]
+
+    kind = rng.choice(len(TRANSACTION_TYPES), size=n, p=TYPE_WEIGHTS)
+    sign = np.array([t[2] for t in TRANSACTION_TYPES])[kind]
+    amounts = np.round(rng.lognormal(mean=7.5, sigma=1.2, size=n)).astype(np.int64) * sign
+    balances = balance + np.cumsum(amounts)
+
+    minutes = start_minute + np.cumsum(rng.integers(1, 30, size=n))
+    when = pd.Timestamp("2024-01-01") + pd.to_timedelta(minutes, unit="min")
+    dates = when.strftime("%d/%m/%y").to_numpy(dtype=object)
+    times = when.strftime("%I:%M %p").to_numpy(dtype=object)
+
+    odd = rng.random(n)
+    twenty_four = odd < TWENTY_FOUR_HOUR
+    times[twenty_four] = when[twenty_four].strftime("%H:%M %p")
+    long_year = (odd >= TWENTY_FOUR_HOUR) & (odd < TWENTY_FOUR_HOUR + LONG_YEAR)
+    dates[long_year] = when[long_year].strftime("%d/%m/%Y")
+    times[long_year] = when[long_year].strftime("%H:%M")
+    broken = odd >= 1 - UNPARSEABLE
+    times[broken] = "??"
+
+    amount_text = amounts.astype(object)
+    commas = rng.random(n) < COMMA_AMOUNTS
+    amount_text[commas] = [f"{a:,}" for a in amounts[commas]]
+
+    prefixes = np.array([t[1] for t in TRANSACTION_TYPES], dtype=object)[kind]
+    suffix = rng.integers(10000, 99999, size=n).astype(str)
+    stamps = when.strftime("%y%m%d.%H%M").to_numpy(dtype=object)
+    references = prefixes + stamps + ".B" + suffix.astype(object)
+
+    frame = pd.DataFrame({
+        "Date": dates,
+        "Time": times,
+        "Transaction Type": np.array([t[0] for t in TRANSACTION_TYPES], dtype=object)[kind],
+        "Details": details,
+        "Reference": references,
+        "Amount (MWK)": amount_text,
+        "Balance": np.round(balances + 0.22, 2),
+    }, columns=COLUMNS)
+    return frame, int(minutes[-1]), float(balances[-1])
+
+
+def generate_statement(path: str, rows: int, seed: int = 0) -> str:
+    """
+    Write a statement of `rows` transactions to path. The same (rows, seed)
+    always produces byte-identical output. Written in chunks, so 5M rows
+    do not need 5M rows of memory.
+    """
+    if not MIN_ROWS <= rows <= MAX_ROWS:
+        raise ValueError(f"rows must be between {MIN_ROWS:,} and {MAX_ROWS:,}")
+    rng = np.random.default_rng(seed)
+    pool = merchant_pool(seed)
+    minute, balance = 0, 50_000.0
+    written = 0
+    while written < rows:
+        n = min(CHUNK_ROWS, rows - written)
+        frame, minute, balance = _chunk(rng, n, pool, minute, balance)
+        frame.to_csv(path, mode="w" if written == 0 else "a", header=written == 0, index=False)
+        written += n
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic statement CSV.")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", required=True)
+    args = parser.parse_args(argv)
+    try:
+        generate_statement(args.out, args.rows, args.seed)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"✅ Wrote {args.rows:,} rows to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+# backend/benchmarks/run.py
+#
+# Per-stage benchmarks of the upload pipeline (see utils/ingest.py):
+#
+#     python -m backend.benchmarks.run --rows 100000
+#     python -m backend.benchmarks.run --rows 100000 --save-baseline
+#     python -m backend.benchmarks.run --rows 100000 --check
+#     python -m backend.benchmarks.run --db-url postgresql://localhost/yanga_bench
+#
+# baseline.json was recorded with the defaults (100k rows, SQLite). It is
+# machine-specific: re-record it with --save-baseline when the machine that
+# runs --check changes. Stages faster than MIN_COMPARED_SECONDS are not
+# rate-checked; record the baseline with a larger --rows to cover them.
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from backend.benchmarks.generator import generate_statement
+from backend.config import CSV_CHUNK_ROWS
+from backend.db.bulk import insert_transactions
+from backend.db.models import Transaction
+from backend.ml.model_utils import load_model, predict_categories
+from backend.utils.categorization import _match_keywords, categorize
+from backend.utils.ingest import clean_chunk, to_records
+from backend.utils.matcher import _compile
+from backend.utils.rules import load_category_keywords
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_TOLERANCE = 0.2
+# Peaks below this are noise and are not compared against the baseline
+MIN_COMPARED_PEAK_MB = 1.0
+# Neither are the rates of stages whose baseline run was shorter than this:
+# at ~0.1 s, scheduler noise alone moves them by 20-30%
+MIN_COMPARED_SECONDS = 0.25
+
+
+class Context:
+    """
+    Models, maps and the database a run needs. The statement itself is
+    streamed in CSV_CHUNK_ROWS chunks, as ingest reads it, so memory stays
+    bounded by the chunk size even for 5M-row statements. Preparing a
+    stage's input (parsing, cleaning) is never part of its timing.
+    """
+
+    def __init__(self, path: str, db_url: str):
+        self.path = path
+        self.db_url = db_url
+        with open(os.path.join(os.path.dirname(__file__), "..", "assets", "memory_map.json"), encoding="utf-8") as f:
+            self.memory_map = json.load(f)
+        self.category_map = load_category_keywords()
+        self.model, self.vectorizer = load_model()
+        self.rows, distinct = 0, set()
+        for chunk in pd.read_csv(path, usecols=["Details"], chunksize=CSV_CHUNK_ROWS):
+            self.rows += len(chunk)
+            distinct.update(chunk["Details"].astype(str))
+        self.distinct_details = len(distinct)
+        self.engine = create_engine(db_url)
+        if db_url.startswith("sqlite"):
+            Transaction.__table__.create(self.engine, checkfirst=True)
+
+    def raw_chunks(self):
+        return pd.read_csv(self.path, chunksize=CSV_CHUNK_ROWS)
+
+    def cleaned_chunks(self):
+        for chunk in self.raw_chunks():
+            chunk = clean_chunk(chunk)
+            if not chunk.empty:
+                yield chunk
+
+    def categorize(self, chunk):
+        return categorize(chunk["Details"], None, self.memory_map, self.category_map, self.model, self.vectorizer)
+
+
+def _time_chunks(chunks, work) -> tuple:
+    """Sum the time `work` spends on each chunk; fetching the next chunk is not timed."""
+    rows, elapsed = 0, 0.0
+    for chunk in chunks:
+        started = time.perf_counter()
+        rows += work(chunk)
+        elapsed += time.perf_counter() - started
+    return rows, elapsed
+
+
+def stage_csv_read(ctx) -> tuple:
+    return _time_chunks([None], lambda _: sum(len(chunk) for chunk in ctx.raw_chunks()))
+
+
+def stage_clean(ctx) -> tuple:
+    return _time_chunks(ctx.raw_chunks(), lambda chunk: len(clean_chunk(chunk)))
+
+
+def stage_memory(ctx) -> tuple:
+    lowered = (chunk["Details"].str.lower() for chunk in ctx.cleaned_chunks())
+    return _time_chunks(lowered, lambda details: len(details.map(ctx.memory_map)))
+
+
+def stage_rules(ctx) -> tuple:
+    _compile.cache_clear()  # the first chunk includes building the automaton
+    lowered = (chunk["Details"].str.lower() for chunk in ctx.cleaned_chunks())
+    return _time_chunks(lowered, lambda details: len(_match_keywords(details, ctx.category_map)))
+
+
+def stage_ml(ctx) -> tuple:
+    # The pipeline predicts each distinct detail of a chunk once
+    def predict(details):
+        predict_categories(ctx.model, ctx.vectorizer, details.unique())
+        return len(details)
+
+    return _time_chunks((chunk["Details"] for chunk in ctx.cleaned_chunks()), predict)
+
+
+def stage_categorize(ctx) -> tuple:
+    return _time_chunks(ctx.cleaned_chunks(), lambda chunk: len(ctx.categorize(chunk)))
+
+
+def stage_db_insert(ctx) -> tuple:
+    records = (
+        to_records(chunk.assign(**ctx.categorize(chunk)), "benchmark", "0" * 32)
+        for chunk in ctx.cleaned_chunks()
+    )
+    # One transaction, like an upload, rolled back so every repeat inserts
+    # into the same starting table
+    with Session(ctx.engine) as db:
+        def insert(batch):
+            insert_transactions(db, batch)
+            return len(batch)
+
+        result = _time_chunks(records, insert)
+        db.rollback()
+    return result
+
+
+STAGES = {
+    "csv_read": stage_csv_read,
+    "clean": stage_clean,
+    "memory": stage_memory,
+    "rules": stage_rules,
+    "ml": stage_ml,
+    "categorize": stage_categorize,
+    "db_insert": stage_db_insert,
+}
+
+
+def measure(stage, ctx, repeat: int, memory: bool) -> dict:
+    """Best time of `repeat` runs, plus the traced peak of one extra run (chunk preparation included)."""
+    best = None
+    for _ in range(repeat):
+        rows, elapsed = stage(ctx)
+        best = elapsed if best is None else min(best, elapsed)
+    result = {
+        "rows": rows,
+        "seconds": round(best, 4),
+        "rows_per_sec": round(rows / best) if best else None,
+    }
+    if memory:
+        tracemalloc.start()
+        try:
+            stage(ctx)
+            result["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 2)
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Return a message for every stage that got slower or hungrier than the
+    baseline allows. Stages too short or too small to measure reliably
+    (MIN_COMPARED_SECONDS, MIN_COMPARED_PEAK_MB) are only checked on the
+    other axis.
+    """
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            continue
+        if base.get("rows_per_sec") and (base.get("seconds") or 0) >= MIN_COMPARED_SECONDS \
+                and current["rows_per_sec"] < base["rows_per_sec"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: {current['rows_per_sec']:,} rows/s vs baseline {base['rows_per_sec']:,}"
+            )
+        if (base.get("peak_mb") or 0) >= MIN_COMPARED_PEAK_MB and "peak_mb" in current \
+                and current["peak_mb"] > base["peak_mb"] * (1 + tolerance):
+            regressions.append(f"{name}: peak {current['peak_mb']} MB vs baseline {base['peak_mb']} MB")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark each stage of the statement ingest pipeline.")
+    parser.add_argument("--rows", type=int, default=100_000, help="synthetic statement size (1k to 5M)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data", help="benchmark this CSV instead of a generated statement")
+    parser.add_argument("--stages", default=",".join(STAGES), help="comma-separated subset of stages")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak-memory run")
+    parser.add_argument("--db-url", help="database for db_insert (default: a temporary SQLite file). "
+                                         "Postgres must already have the schema; inserts are rolled back.")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true", help="exit 1 if a stage regressed past --tolerance")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    stages = [name.strip() for name in args.stages.split(",") if name.strip()]
+    unknown = [name for name in stages if name not in STAGES]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+
+    workdir = tempfile.mkdtemp(prefix="yanga-bench-")
+    path = args.data
+    if path is None:
+        path = os.path.join(tempfile.gettempdir(), f"yanga-bench-{args.rows}-{args.seed}.csv")
+        if not os.path.exists(path):
+            print(f"📝 Generating {args.rows:,} rows into {path}...")
+            try:
+                generate_statement(path, args.rows, args.seed)
+            except ValueError as e:
+                parser.error(str(e))
+    db_url = args.db_url or f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+
+    print("⏳ Preparing inputs...")
+    ctx = Context(path, db_url)
+    print(f"🏁 {ctx.rows:,} rows, {ctx.distinct_details:,} distinct details, "
+          f"db {ctx.engine.dialect.name}")
+
+    results = {}
+    for name in stages:
+        results[name] = measure(STAGES[name], ctx, args.repeat, not args.no_memory)
+        r = results[name]
+        peak = f"{r['peak_mb']:>9.2f} MB" if "peak_mb" in r else ""
+        print(f"   {name:<11} {r['seconds']:>9.3f} s {r['rows_per_sec']:>12,} rows/s {peak}")
+
+    ctx.engine.dispose()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "rows": ctx.rows,
+        "seed": args.seed if args.data is None else None,
+        "data": os.path.basename(path),
+        "db": ctx.engine.dialect.name,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "created_at": datetime.utcnow().isoformat(),
+        "results": results,
+    }
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Baseline saved to {args.baseline}")
+
+    if args.check:
+        if not os.path.exists(args.baseline):
+            print(f"❌ No baseline at {args.baseline}; run with --save-baseline first.")
+            sys.exit(1)
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if (baseline.get("rows"), baseline.get("db")) != (report["rows"], report["db"]):
+            print(f"⚠️ Baseline was recorded with {baseline.get('rows'):,} rows on {baseline.get('db')}; "
+                  f"comparing anyway.")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"❌ Regressions beyond {args.tolerance:.0%}:")
+            for message in regressions:
+                print(f"   {message}")
+            sys.exit(1)
+        print(f"✅ No stage regressed beyond {args.tolerance:.0%}.")
+
+
+if __name__ == "__main__":
+    main()
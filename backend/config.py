@@ -5,3 +5,94 @@ UPLOAD_DIR = os.path.join(os.path.dirname(__file__), "uploads")
 
 # Create folder if it doesn't exist
 os.makedirs(UPLOAD_DIR, exist_ok=True)
+
+# Rows per multi-row INSERT when storing uploaded transactions
+INSERT_BATCH_SIZE = int(os.getenv("INSERT_BATCH_SIZE", "1000"))
+
+# Maximum rows per vectorizer.transform/model.predict call
+ML_BATCH_SIZE = int(os.getenv("ML_BATCH_SIZE", "5000"))
+
+# Bytes read from the request body per write when spooling uploads to disk
+UPLOAD_CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", str(1024 * 1024)))
+
+# Rows parsed, categorized and inserted per chunk of an uploaded CSV
+CSV_CHUNK_ROWS = int(os.getenv("CSV_CHUNK_ROWS", "50000"))
+
+# Worker processes for background (async mode) ingestion jobs
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "2"))
+# A queued or running job whose row has not been updated for this long
+# (running jobs update it after every chunk) is reported as failed: its
+# worker or the whole server went away without recording the outcome
+INGEST_JOB_STALE_SECONDS = int(os.getenv("INGEST_JOB_STALE_SECONDS", "900"))
+
+# strptime format of the combined "Date Time" columns in our bank exports
+DATE_FORMAT = os.getenv("DATE_FORMAT", "%d/%m/%y %I:%M %p")
+
+# Formats tried, in order, for rows the primary format could not parse.
+# Separate entries with ";" when overriding.
+DATE_FALLBACK_FORMATS = [
+    fmt for fmt in os.getenv(
+        "DATE_FALLBACK_FORMATS",
+        "%d/%m/%y %H:%M %p;%d/%m/%Y %I:%M %p;%d/%m/%Y %H:%M;%Y-%m-%d %H:%M:%S",
+    ).split(";")
+    if fmt
+]
+
+# In-process response cache for dashboard/summary/export endpoints
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "256"))
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "60"))
+
+# Generated PDF reports: worker threads and how long unused reports are kept
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", "2"))
+REPORT_MAX_AGE_SECONDS = int(os.getenv("REPORT_MAX_AGE_SECONDS", str(7 * 24 * 3600)))
+
+# Database connection pool (applies to both the sync and async engines)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+# How often (seconds) each process checks the category memory table for
+# writes made by other workers before serving its cached copy
+MEMORY_CACHE_TTL = float(os.getenv("MEMORY_CACHE_TTL", "5"))
+
+# How often (seconds) the resource manager checks keyword rules, the
+# memory store and the model files for changes; 0 disables the watcher
+RESOURCE_POLL_SECONDS = float(os.getenv("RESOURCE_POLL_SECONDS", "10"))
+
+# Upper bound for `import backend.main` checked by scripts/check_import_time.py
+IMPORT_TIME_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "800"))
+
+# Optional shared inference server (python -m backend.ml.inference_server).
+# When INFERENCE_SOCKET is set, API and job workers send predictions to the
+# server on that Unix socket instead of loading their own model copy.
+INFERENCE_SOCKET = os.getenv("INFERENCE_SOCKET", "")
+INFERENCE_AUTHKEY = os.getenv("INFERENCE_AUTHKEY", "").encode() or None
+# How long the server waits for more requests to join a batch, and the cap on its size
+INFERENCE_BATCH_WINDOW_MS = float(os.getenv("INFERENCE_BATCH_WINDOW_MS", "5"))
+INFERENCE_MAX_BATCH = int(os.getenv("INFERENCE_MAX_BATCH", str(ML_BATCH_SIZE)))
+
+# Storage format of the categorized copy of each upload: "parquet" (needs
+# pyarrow), "csv", or "auto" to use Parquet whenever pyarrow is installed
+ARTIFACT_FORMAT = os.getenv("ARTIFACT_FORMAT", "auto").lower()
+
+# Record stage timers, request latency and ML batch sizes for GET /metrics
+# (when off, /metrics still reports cache and pool stats)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Opt-in slow-request profiler: requests slower than PROFILE_SLOW_REQUEST_MS
+# (0 disables it) get their sampled stacks written to PROFILE_DIR in folded
+# format, for flamegraph.pl or speedscope. PROFILE_SAMPLE_RATE is the share of
+# requests sampled; only one request is profiled at a time.
+PROFILE_SLOW_REQUEST_MS = float(os.getenv("PROFILE_SLOW_REQUEST_MS", "0"))
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "1.0"))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(UPLOAD_DIR, "profiles"))
+# Oldest profiles beyond this many are deleted
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "50"))
+
+# Distinct details held by the in-process search index used when the
+# database is not Postgres (local development and tests only). Details
+# beyond the cap are not indexed and cannot be found by search.
+SEARCH_FALLBACK_MAX_DETAILS = int(os.getenv("SEARCH_FALLBACK_MAX_DETAILS", "100000"))
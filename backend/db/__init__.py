@@ -1,3 +1,2 @@
-from .db import engine, SessionLocal, Base, get_db
-
+from .db import engine, SessionLocal, Base, get_db, get_async_engine, AsyncSessionLocal, get_async_db
 
@@ -0,0 +1,118 @@
+# backend/db/bulk.py
+
+from collections import Counter
+
+from sqlalchemy import String, case, column, func, or_, update, values
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from backend.config import INSERT_BATCH_SIZE
+from .models import Transaction, UploadedFile
+
+_DIALECT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def insert_transactions(db: Session, records: list, batch_size: int = INSERT_BATCH_SIZE) -> int:
+    """
+    Insert transaction rows in multi-row batches, silently skipping any row
+    that already exists under the natural key (details, amount, transaction_date).
+    Returns the number of rows actually inserted. The caller owns the commit.
+    """
+    if not records:
+        return 0
+
+    dialect = db.get_bind().dialect.name
+    insert = _DIALECT_INSERTS.get(dialect)
+    if insert is None:
+        raise RuntimeError(f"Bulk insert is not supported for dialect '{dialect}'")
+
+    added = 0
+    for start in range(0, len(records), batch_size):
+        batch = records[start:start + batch_size]
+        stmt = (
+            insert(Transaction)
+            .values(batch)
+            .on_conflict_do_nothing(index_elements=["details", "amount", "transaction_date"])
+        )
+        added += db.execute(stmt).rowcount
+    return added
+
+
+def normalize_details(value: str) -> str:
+    """The form corrections and the memory store match details on."""
+    return str(value).strip().lower()
+
+
+def apply_category_corrections(db: Session, file_id, corrections: dict) -> Counter:
+    """
+    Set the category of transactions from a {details: category} map in one
+    UPDATE, matching details case- and whitespace-insensitively, and clear
+    their needs_confirmation flag. Limited to file_id, or every file when
+    file_id is None. Rows already in that state are left alone.
+    On Postgres the map is joined as UPDATE ... FROM (VALUES ...); other
+    dialects use a CASE expression.
+    Returns {file_id: rows changed}. The caller owns the commit.
+    """
+    corrections = {
+        normalize_details(detail): category
+        for detail, category in corrections.items()
+        if normalize_details(detail)
+    }
+    if not corrections:
+        return Counter()
+
+    normalized = func.lower(func.trim(Transaction.details))
+    if db.get_bind().dialect.name == "postgresql":
+        mapping = values(
+            column("detail", String), column("category", String), name="corrections"
+        ).data(list(corrections.items()))
+        new_category = mapping.c.category
+        match = [normalized == mapping.c.detail]
+    else:
+        new_category = case(corrections, value=normalized)
+        match = [normalized.in_(list(corrections))]
+    if file_id is not None:
+        match.append(Transaction.file_id == file_id)
+
+    # Core UPDATE on the table: nothing in the session needs syncing, and
+    # RETURNING hands back the file of every row that changed
+    table = Transaction.__table__
+    stmt = (
+        update(table)
+        .where(
+            *match,
+            or_(table.c.category.is_distinct_from(new_category), table.c.needs_confirmation.is_(True)),
+        )
+        .values(category=new_category, needs_confirmation=False)
+        .returning(table.c.file_id)
+    )
+    return Counter(db.execute(stmt).scalars())
+
+
+def record_uploaded_file(db: Session, file_hash: str, file_id: str, size_bytes: int, stats: dict) -> None:
+    """
+    Remember that a statement with this content hash was ingested as file_id.
+    A concurrent upload of the same bytes that recorded first wins. Uploads
+    that stored no rows (and so wrote no artifact) are not remembered, so
+    re-uploading them ingests again instead of returning an empty file_id.
+    The caller owns the commit.
+    """
+    if not stats["stored"]:
+        return
+    insert = _DIALECT_INSERTS[db.get_bind().dialect.name]
+    db.execute(
+        insert(UploadedFile)
+        .values(
+            file_hash=file_hash,
+            file_id=file_id,
+            size_bytes=size_bytes,
+            rows_processed=stats["rows"],
+            rows_stored=stats["stored"],
+            rows_added=stats["added"],
+            rows_skipped=stats["skipped"],
+        )
+        .on_conflict_do_nothing(index_elements=["file_hash"])
+    )
@@ -4,6 +4,11 @@ import os
 from sqlalchemy import create_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
+from backend.config import (
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING,
+)
+from .pool_metrics import InstrumentedQueuePool, InstrumentedAsyncQueuePool
+
 # Load database credentials from environment or fallback defaults
 db_user = os.getenv("POSTGRES_USER", "postgres")
 db_pass = os.getenv("POSTGRES_PASSWORD", "18200211DATA")
@@ -11,11 +16,43 @@ db_name = os.getenv("POSTGRES_DB", "yanga")
 db_host = os.getenv("POSTGRES_HOST", "localhost")
 db_port = os.getenv("POSTGRES_PORT", "5432")
 
-# Build PostgreSQL connection URL
-DATABASE_URL = f"postgresql://{db_user}:{db_pass}@{db_host}:{db_port}/{db_name}"
+# Build PostgreSQL connection URL (DATABASE_URL overrides, e.g. sqlite:///./yanga.db for local testing)
+DATABASE_URL = os.getenv(
+    "DATABASE_URL", f"postgresql://{db_user}:{db_pass}@{db_host}:{db_port}/{db_name}"
+)
+
+# Async drivers for each sync URL scheme we support
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def _async_url(url: str) -> str:
+    scheme, sep, rest = url.partition("://")
+    return f"{_ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _async_url(DATABASE_URL)
+
+
+def _pool_options(url: str, poolclass) -> dict:
+    """Pool settings from the environment; in-memory SQLite keeps its own pool."""
+    if url.startswith("sqlite") and ":memory:" in url:
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
 
 # Setup engine and session
-engine = create_engine(DATABASE_URL)
+engine = create_engine(DATABASE_URL, **_pool_options(DATABASE_URL, InstrumentedQueuePool))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Declare Base for models
@@ -28,3 +65,32 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# ─── Async engine (asyncpg for Postgres, aiosqlite for SQLite) ─────
+# Created on first use so the sync-only scripts never need an async driver installed.
+_async_engine = None
+_async_sessionmaker = None
+
+
+def get_async_engine():
+    global _async_engine, _async_sessionmaker
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        _async_engine = create_async_engine(
+            ASYNC_DATABASE_URL, **_pool_options(ASYNC_DATABASE_URL, InstrumentedAsyncQueuePool)
+        )
+        _async_sessionmaker = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+    return _async_engine
+
+
+def AsyncSessionLocal():
+    get_async_engine()
+    return _async_sessionmaker()
+
+
+# Dependency to get an async database session for `async def` endpoints
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
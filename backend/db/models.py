@@ -1,14 +1,17 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Index  # ✅ Boolean added
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Index, UniqueConstraint, Text, PrimaryKeyConstraint, func  # ✅ Boolean added
 from datetime import datetime
 from .db import Base
 
+# Columns that identify the same real-world transaction across uploads
+NATURAL_KEY = ("details", "amount", "transaction_date")
+
 
 class Transaction(Base):
     __tablename__ = "transactions"
 
     id = Column(Integer, primary_key=True, index=True)
     file_id = Column(String, index=True)
-    file_hash = Column(String(32), unique=True, index=True)
+    file_hash = Column(String(32), index=True)  # MD5 of the uploaded statement
     details = Column(String(255), nullable=False)
     amount = Column(Float, nullable=False)
     category = Column(String(50), nullable=True)
@@ -23,7 +26,80 @@ class Transaction(Base):
     __table_args__ = (
         Index('idx_file_category', 'file_hash', 'category'),
         Index('idx_date_amount', 'transaction_date', 'amount'),
+        Index('idx_file_date_id', 'file_id', 'transaction_date', 'id'),
+        Index('idx_date_id', 'transaction_date', 'id'),
+        Index('idx_category_date_id', 'category', 'transaction_date', 'id'),
+        Index('idx_file_id_category', 'file_id', 'category'),
+        Index('idx_details_normalized', func.lower(func.trim(details))),  # category corrections
+        UniqueConstraint(*NATURAL_KEY, name='uq_transactions_natural_key'),
     )
 
     def __repr__(self):
         return f"<Transaction(id={self.id}, amount={self.amount}, category={self.category}, date={self.transaction_date})>"
+
+
+class IngestJob(Base):
+    __tablename__ = "ingest_jobs"
+
+    id = Column(String(36), primary_key=True)
+    file_id = Column(String, nullable=False, index=True)
+    status = Column(String(16), nullable=False, default="queued")  # queued | running | completed | failed
+    rows_processed = Column(Integer, nullable=False, default=0)
+    rows_stored = Column(Integer, nullable=False, default=0)
+    rows_added = Column(Integer, nullable=False, default=0)
+    rows_skipped = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<IngestJob(id={self.id}, status={self.status}, rows_processed={self.rows_processed})>"
+
+
+class TransactionRollup(Base):
+    """Per-file monthly income/spend totals by category, kept in step with transactions."""
+    __tablename__ = "transaction_rollups"
+
+    file_id = Column(String, nullable=False)
+    month = Column(String(7), nullable=False)  # YYYY-MM
+    category = Column(String(50), nullable=False)
+    income_total = Column(Float, nullable=False, default=0)
+    income_count = Column(Integer, nullable=False, default=0)
+    spend_total = Column(Float, nullable=False, default=0)  # stored as a positive amount
+    spend_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        PrimaryKeyConstraint('file_id', 'month', 'category'),
+    )
+
+    def __repr__(self):
+        return f"<TransactionRollup(file_id={self.file_id}, month={self.month}, category={self.category})>"
+
+
+class UploadedFile(Base):
+    """One row per distinct statement file ingested, keyed by its content hash."""
+    __tablename__ = "uploaded_files"
+
+    file_hash = Column(String(32), primary_key=True)  # MD5 of the raw upload
+    file_id = Column(String, nullable=False, index=True)
+    size_bytes = Column(Integer, nullable=False, default=0)
+    rows_processed = Column(Integer, nullable=False, default=0)
+    rows_stored = Column(Integer, nullable=False, default=0)
+    rows_added = Column(Integer, nullable=False, default=0)
+    rows_skipped = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<UploadedFile(file_hash={self.file_hash}, file_id={self.file_id})>"
+
+
+class CategoryMemory(Base):
+    """Categories the user has taught us, keyed by lower-cased transaction details."""
+    __tablename__ = "category_memory"
+
+    detail = Column(String(255), primary_key=True)
+    category = Column(String(50), nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<CategoryMemory(detail={self.detail}, category={self.category})>"
@@ -0,0 +1,98 @@
+# backend/db/pool_metrics.py
+
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolMetrics:
+    """Checkout counters and wait times for one engine's connection pool."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool = None  # most recent pool instance (engines recreate pools on dispose)
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.overflow_events = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_checkout(self, waited: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def record_overflow(self):
+        with self._lock:
+            self.overflow_events += 1
+
+    def snapshot(self) -> dict:
+        pool = self.pool
+        with self._lock:
+            stats = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "overflow_events": self.overflow_events,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+                "wait_seconds_avg": round(self.wait_seconds_total / self.checkouts, 6) if self.checkouts else 0.0,
+            }
+        if isinstance(pool, QueuePool):
+            stats.update({
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+            })
+        return stats
+
+
+SYNC_POOL_METRICS = PoolMetrics("sync")
+ASYNC_POOL_METRICS = PoolMetrics("async")
+
+
+class _InstrumentedPoolMixin:
+    metrics: PoolMetrics = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics.pool = self
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            conn = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record_checkout(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record_checkout(time.perf_counter() - start)
+        return conn
+
+    def _inc_overflow(self):
+        created = super()._inc_overflow()
+        if created and self._overflow > 0:
+            # A connection beyond pool_size was opened
+            self.metrics.record_overflow()
+        return created
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    metrics = SYNC_POOL_METRICS
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    metrics = ASYNC_POOL_METRICS
+
+
+def pool_stats() -> dict:
+    return {
+        metrics.name: metrics.snapshot()
+        for metrics in (SYNC_POOL_METRICS, ASYNC_POOL_METRICS)
+    }
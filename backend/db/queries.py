@@ -0,0 +1,147 @@
+# backend/db/queries.py
+
+import base64
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from sqlalchemy import and_, case, func, or_, select
+from sqlalchemy.orm import Session
+
+from .models import Transaction
+
+
+def month_bucket(db: Session, column=Transaction.transaction_date):
+    """'YYYY-MM' label for a datetime column in the active dialect."""
+    if db.get_bind().dialect.name == "sqlite":
+        return func.strftime("%Y-%m", column)
+    return func.to_char(column, "YYYY-MM")
+
+
+def transaction_filters(file_id: Optional[str] = None, start: Optional[date] = None,
+                        end: Optional[date] = None, category: Optional[str] = None,
+                        min_amount: Optional[float] = None, max_amount: Optional[float] = None,
+                        needs_confirmation: Optional[bool] = None) -> list:
+    """WHERE clauses for the given filters; the date range is inclusive."""
+    filters = []
+    if file_id is not None:
+        filters.append(Transaction.file_id == file_id)
+    if start is not None:
+        filters.append(Transaction.transaction_date >= datetime.combine(start, time.min))
+    if end is not None:
+        filters.append(Transaction.transaction_date < datetime.combine(end + timedelta(days=1), time.min))
+    if category is not None:
+        filters.append(Transaction.category == category)
+    if min_amount is not None:
+        filters.append(Transaction.amount >= min_amount)
+    if max_amount is not None:
+        filters.append(Transaction.amount <= max_amount)
+    if needs_confirmation is not None:
+        filters.append(Transaction.needs_confirmation.is_(needs_confirmation))
+    return filters
+
+
+def latest_file_query():
+    """file_id of the upload holding the most recent transaction timestamp."""
+    return select(Transaction.file_id).order_by(Transaction.timestamp.desc()).limit(1)
+
+
+def spending_summary(db: Session, filters: list) -> dict:
+    """
+    Totals, per-category spending and the distinct categories, computed
+    with GROUP BY in the database. Spending amounts are reported as
+    positive numbers.
+    """
+    amount = Transaction.amount
+    totals = db.execute(
+        select(
+            func.count(Transaction.id),
+            func.coalesce(func.sum(case((amount > 0, amount), else_=0)), 0),
+            func.coalesce(func.sum(case((amount < 0, -amount), else_=0)), 0),
+        ).where(*filters)
+    ).one()
+    count, total_income, total_spent = totals
+
+    category = func.coalesce(Transaction.category, "Uncategorized")
+    categories = db.scalars(select(category).where(*filters).distinct().order_by(category)).all()
+    rows = db.execute(
+        select(category.label("category"), func.sum(-amount).label("spent"))
+        .where(*filters, amount < 0)
+        .group_by(category)
+        .order_by(category)
+    ).all()
+    breakdown = [
+        {
+            "Category": row.category,
+            "Amount (MWK)": float(row.spent),
+            "Percentage": round(float(row.spent) / float(total_spent) * 100, 2) if total_spent else 0.0,
+        }
+        for row in rows
+    ]
+
+    return {
+        "count": count,
+        "categories": list(categories),
+        "total_income": float(total_income),
+        "total_spent": float(total_spent),
+        "category_breakdown": breakdown,
+    }
+
+
+def monthly_trends(db: Session, filters: list) -> list:
+    """Net amount per calendar month, oldest first."""
+    month = month_bucket(db)
+    rows = db.execute(
+        select(month.label("month"), func.sum(Transaction.amount).label("net"))
+        .where(*filters)
+        .group_by(month)
+        .order_by(month)
+    ).all()
+    return [{"Month": row.month, "Net Amount": float(row.net)} for row in rows]
+
+
+# Columns the listing endpoint may project
+LISTING_COLUMNS = {
+    "id": Transaction.id,
+    "file_id": Transaction.file_id,
+    "details": Transaction.details,
+    "amount": Transaction.amount,
+    "category": Transaction.category,
+    "transaction_date": Transaction.transaction_date,
+    "timestamp": Transaction.timestamp,
+    "needs_confirmation": Transaction.needs_confirmation,
+}
+
+
+def encode_cursor(transaction_date: datetime, txn_id: int) -> str:
+    raw = f"{transaction_date.isoformat()}|{txn_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Inverse of encode_cursor; raises ValueError on a malformed cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        when, txn_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(when), int(txn_id)
+    except Exception as e:
+        raise ValueError("Invalid cursor.") from e
+
+
+def transaction_page(filters: list, fields: list, limit: int, cursor: Optional[str] = None):
+    """
+    Keyset-paginated SELECT, newest first, ordered by (transaction_date, id).
+    Fetches limit + 1 rows so the caller can tell whether another page exists.
+    """
+    columns = [LISTING_COLUMNS[name] for name in fields]
+    for key in ("transaction_date", "id"):
+        if key not in fields:
+            columns.append(LISTING_COLUMNS[key])
+
+    stmt = select(*columns).where(*filters)
+    if cursor:
+        after_date, after_id = decode_cursor(cursor)
+        stmt = stmt.where(or_(
+            Transaction.transaction_date < after_date,
+            and_(Transaction.transaction_date == after_date, Transaction.id < after_id),
+        ))
+    return stmt.order_by(Transaction.transaction_date.desc(), Transaction.id.desc()).limit(limit + 1)
@@ -0,0 +1,128 @@
+# backend/db/rollups.py
+
+from sqlalchemy import bindparam, case, delete, func, insert, select, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.types import Text
+from sqlalchemy.orm import Session
+
+from .models import Transaction, TransactionRollup
+from .queries import month_bucket
+
+
+# Postgres advisory locks serializing rollup writes. Per-file refreshes hold
+# (ROLLUP_LOCK_CLASS, hashtext(file_id)) and share ROLLUP_TABLE_LOCK, which a
+# full rebuild takes exclusively; the two-key and one-key spaces never overlap.
+ROLLUP_LOCK_CLASS = 7401
+ROLLUP_TABLE_LOCK = 7401
+
+_LOCK_FILES = text(
+    "SELECT pg_advisory_xact_lock(:lock_class, k) FROM "
+    "(SELECT DISTINCT hashtext(f) AS k FROM unnest(:file_ids) AS f ORDER BY k) AS keys"
+).bindparams(bindparam("file_ids", type_=ARRAY(Text)))
+
+
+def _lock_rollups(db: Session, file_ids=None) -> None:
+    """
+    Serialize rollup writers until the transaction ends. Without this, two
+    READ COMMITTED refreshes of one file both delete its rows and the second
+    INSERT fails on the primary key. Keys are taken in a fixed order so
+    multi-file refreshes cannot deadlock. SQLite serializes writers already.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    if file_ids is None:
+        db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": ROLLUP_TABLE_LOCK})
+        return
+    db.execute(text("SELECT pg_advisory_xact_lock_shared(:key)"), {"key": ROLLUP_TABLE_LOCK})
+    db.execute(_LOCK_FILES, {"lock_class": ROLLUP_LOCK_CLASS, "file_ids": sorted(file_ids)})
+
+
+def _rollup_select(db: Session, filters: list):
+    amount = Transaction.amount
+    month = month_bucket(db)
+    category = func.coalesce(Transaction.category, "Uncategorized")
+    return (
+        select(
+            Transaction.file_id,
+            month,
+            category,
+            func.coalesce(func.sum(case((amount > 0, amount), else_=0)), 0),
+            func.count(case((amount > 0, 1))),
+            func.coalesce(func.sum(case((amount < 0, -amount), else_=0)), 0),
+            func.count(case((amount < 0, 1))),
+        )
+        .where(Transaction.file_id.is_not(None), *filters)
+        .group_by(Transaction.file_id, month, category)
+    )
+
+
+def _replace(db: Session, filters: list, rollup_filters: list) -> None:
+    db.execute(delete(TransactionRollup).where(*rollup_filters))
+    db.execute(
+        insert(TransactionRollup).from_select(
+            ["file_id", "month", "category", "income_total", "income_count", "spend_total", "spend_count"],
+            _rollup_select(db, filters),
+        )
+    )
+
+
+def refresh_rollups(db: Session, file_ids) -> None:
+    """
+    Recompute the rollup rows of the given files from their transactions.
+    Work is proportional to the size of those files, not the whole table.
+    Concurrent refreshes of the same file wait for each other. The caller
+    owns the commit.
+    """
+    file_ids = [file_id for file_id in set(file_ids) if file_id is not None]
+    if not file_ids:
+        return
+    _lock_rollups(db, file_ids)
+    _replace(
+        db,
+        [Transaction.file_id.in_(file_ids)],
+        [TransactionRollup.file_id.in_(file_ids)],
+    )
+
+
+def rebuild_rollups(db: Session) -> None:
+    """Recompute every rollup row from scratch. The caller owns the commit."""
+    _lock_rollups(db)
+    _replace(db, [], [])
+
+
+def rollup_summary(db: Session, file_id: str) -> dict:
+    """
+    Same shape as queries.spending_summary plus monthly_trends, read from
+    the rollup table instead of scanning transactions.
+    """
+    rows = db.execute(
+        select(TransactionRollup).where(TransactionRollup.file_id == file_id)
+    ).scalars().all()
+
+    total_income = sum(row.income_total for row in rows)
+    total_spent = sum(row.spend_total for row in rows)
+
+    by_category, by_month = {}, {}
+    for row in rows:
+        if row.spend_count:
+            by_category[row.category] = by_category.get(row.category, 0.0) + row.spend_total
+        by_month[row.month] = by_month.get(row.month, 0.0) + row.income_total - row.spend_total
+
+    return {
+        "count": sum(row.income_count + row.spend_count for row in rows),
+        "categories": sorted({row.category for row in rows}),
+        "total_income": float(total_income),
+        "total_spent": float(total_spent),
+        "category_breakdown": [
+            {
+                "Category": category,
+                "Amount (MWK)": float(spent),
+                "Percentage": round(spent / total_spent * 100, 2) if total_spent else 0.0,
+            }
+            for category, spent in sorted(by_category.items())
+        ],
+        "monthly_trends": [
+            {"Month": month, "Net Amount": float(net)}
+            for month, net in sorted(by_month.items())
+        ],
+    }
@@ -0,0 +1,152 @@
+# backend/db/search.py
+
+import re
+import threading
+
+from sqlalchemy import func, literal, literal_column, or_, select
+from sqlalchemy.orm import Session
+
+from backend.config import SEARCH_FALLBACK_MAX_DETAILS
+
+from .models import Transaction
+
+# Minimum score for a fuzzy (trigram) match, as pg_trgm's default threshold
+SIMILARITY_THRESHOLD = 0.3
+
+RESULT_COLUMNS = (
+    Transaction.id,
+    Transaction.file_id,
+    Transaction.details,
+    Transaction.amount,
+    Transaction.category,
+    Transaction.transaction_date,
+    Transaction.needs_confirmation,
+)
+
+
+def search_transactions(db: Session, query: str, filters: list, limit: int, offset: int = 0) -> list:
+    """
+    Ranked search over transaction details. Postgres uses the details_tsv
+    full-text column plus pg_trgm fuzzy matching; other databases fall back
+    to an in-process trigram index, meant for local development and tests
+    (see DetailsIndex). Blocking either way: call it from a worker thread.
+    Returns up to limit + 1 rows (each with a rank) so the caller can tell
+    whether another page exists.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return _search_postgres(db, query, filters, limit, offset)
+    return _search_fallback(db, query, filters, limit, offset)
+
+
+# ─── Postgres: tsvector + pg_trgm ─────────────────────────────────
+def _search_postgres(db: Session, query: str, filters: list, limit: int, offset: int) -> list:
+    # details_tsv is a generated column (see the migration), so it is not mapped on the model
+    tsv = literal_column("transactions.details_tsv")
+    tsq = func.websearch_to_tsquery("simple", query)
+    rank = func.greatest(func.ts_rank(tsv, tsq), func.word_similarity(query, Transaction.details))
+    stmt = (
+        select(*RESULT_COLUMNS, rank.label("rank"))
+        .where(
+            or_(
+                tsv.op("@@")(tsq),
+                literal(query, Transaction.details.type).op("<%")(Transaction.details),
+                Transaction.details.icontains(query, autoescape=True),
+            ),
+            *filters,
+        )
+        .order_by(rank.desc(), Transaction.id.desc())
+        .limit(limit + 1)
+        .offset(offset)
+    )
+    return [dict(row._mapping) for row in db.execute(stmt)]
+
+
+# ─── Fallback: in-process trigram index ───────────────────────────
+_WORD = re.compile(r"\w+")
+
+
+def trigrams(text: str) -> set:
+    """pg_trgm-style trigrams: each lowercased word padded with two leading and one trailing space."""
+    grams = set()
+    for word in _WORD.findall(text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _similarity(a: set, b: set) -> float:
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+class DetailsIndex:
+    """
+    Inverted trigram index over distinct transaction details. It is filled
+    incrementally from rows with an id above the last one seen, so newly
+    inserted transactions become searchable on the next query. It lives in
+    each process's memory, so it holds at most `max_details` distinct
+    details; production search runs on Postgres instead.
+    """
+
+    def __init__(self, max_details: int = SEARCH_FALLBACK_MAX_DETAILS):
+        self.max_details = max_details
+        self.full = False
+        self._lock = threading.Lock()
+        self._last_id = 0
+        self._grams = {}  # details -> (trigrams of the whole string, [trigrams per word])
+        self._postings = {}  # trigram -> set of details
+
+    def refresh(self, db: Session):
+        with self._lock:
+            rows = db.execute(
+                select(Transaction.id, Transaction.details)
+                .where(Transaction.id > self._last_id)
+                .order_by(Transaction.id)
+            ).all()
+            for txn_id, details in rows:
+                self._last_id = txn_id
+                if details in self._grams:
+                    continue
+                if len(self._grams) >= self.max_details:
+                    if not self.full:
+                        print(f"⚠️ Search index is full ({self.max_details} details); "
+                              f"newer details are not searchable without Postgres")
+                        self.full = True
+                    continue
+                whole = trigrams(details)
+                self._grams[details] = (whole, [trigrams(word) for word in _WORD.findall(details)])
+                for gram in whole:
+                    self._postings.setdefault(gram, set()).add(details)
+
+    def score(self, query: str, details: str) -> float:
+        if query.lower() in details.lower():
+            return 1.0
+        whole, words = self._grams[details]
+        query_grams = trigrams(query)
+        return max([_similarity(query_grams, whole)] + [_similarity(query_grams, w) for w in words])
+
+    def match(self, query: str) -> dict:
+        """Return {details: score} for every indexed detail scoring above the threshold."""
+        with self._lock:
+            candidates = set()
+            for gram in trigrams(query):
+                candidates |= self._postings.get(gram, set())
+            scored = {details: self.score(query, details) for details in candidates}
+        return {details: s for details, s in scored.items() if s >= SIMILARITY_THRESHOLD}
+
+
+_fallback_index = DetailsIndex()
+
+
+def _search_fallback(db: Session, query: str, filters: list, limit: int, offset: int) -> list:
+    _fallback_index.refresh(db)
+    scores = _fallback_index.match(query)
+    if not scores:
+        return []
+    rows = db.execute(
+        select(*RESULT_COLUMNS).where(Transaction.details.in_(list(scores)), *filters)
+    ).all()
+    ranked = sorted(
+        ({**row._mapping, "rank": scores[row.details]} for row in rows),
+        key=lambda row: (-row["rank"], -row["id"]),
+    )
+    return ranked[offset:offset + limit + 1]
@@ -1,19 +1,13 @@
-import json
-import os
+from backend.utils.memory import load_memory, memory_store
 
-MEMORY_PATH = "ml/memory.json"
-
-def load_memory():
-    if os.path.exists(MEMORY_PATH):
-        with open(MEMORY_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {}
 
 def save_memory(memory):
-    with open(MEMORY_PATH, "w", encoding="utf-8") as f:
-        json.dump(memory, f, indent=2)
+    """Persist the entries of memory that changed; the store keeps the rest."""
+    current = load_memory()
+    changed = {desc: cat for desc, cat in memory.items() if current.get(desc) != cat}
+    memory_store.upsert(changed)
 
 def update_memory(memory, corrections):
     for desc, category in corrections.items():
         memory[desc.lower()] = category
-    save_memory(memory)
+    memory_store.upsert(corrections)
@@ -1,29 +1,42 @@
 import os
 import uuid
+import asyncio
 import hashlib
+import time
 from io import StringIO
 from typing import Optional, Dict
-from datetime import datetime
+from datetime import date, datetime
 
-import pandas as pd
-from fastapi import FastAPI, File, UploadFile, HTTPException, Depends, Body, Query
+from fastapi import FastAPI, File, UploadFile, HTTPException, Depends, Body, Query, Header, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse, RedirectResponse
+from fastapi.responses import JSONResponse, FileResponse, RedirectResponse, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
-
-from backend.db.db import get_db
-from backend.db.models import Transaction
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.db.db import get_db, get_async_db, SessionLocal
+from backend.db.pool_metrics import pool_stats
+from backend.db.search import search_transactions
+from backend.db.models import Transaction, IngestJob, UploadedFile
+from backend.db.queries import (
+    transaction_filters, spending_summary, monthly_trends,
+    LISTING_COLUMNS, transaction_page, encode_cursor, latest_file_query,
+)
+from backend.db.rollups import rollup_summary, refresh_rollups
+from backend.db.bulk import apply_category_corrections, record_uploaded_file
 from backend.models.transaction_response import TransactionUploadResponse
-from backend.utils.rules import auto_categorize, load_category_keywords
-from backend.utils.memory import load_memory, apply_memory, update_memory
-from backend.utils.categorizer import get_model, predict_category, MEMORY_MAP
-from backend.utils.export_pdf import generate_pdf_report
-from backend.ml.model_utils import load_model
+from backend.models.job_response import IngestJobResponse
+from backend.utils.memory import load_memory, memory_store
+from backend.utils.profiling import start_request_profile, finish_request_profile
+from backend.utils.jobs import submit_ingest_job, shutdown_jobs, fail_stale_jobs, is_stale
+from backend.utils.export_pdf import ensure_report, report_digest
+from backend.utils import metrics
+from backend.utils.cache import response_cache, MISSING
+from backend.utils.matcher import matcher_cache_info
+from backend.utils.resources import resources
+from backend.utils.storage import artifact_path, find_artifact
 from urllib.parse import quote
 
-# ─── Load ML Model ─────────────────────────────────────────────────
-model, vectorizer = load_model()
 # uploads 
 UPLOAD_DIR = "./uploads"
 # ─── App Initialization ────────────────────────────────────────────
@@ -39,9 +52,44 @@ app.add_middleware(
 
 UPLOAD_DIR = os.path.join(os.path.dirname(__file__), "uploads")
 os.makedirs(UPLOAD_DIR, exist_ok=True)
+REPORTS_DIR = os.path.join(UPLOAD_DIR, "reports")
+
+@app.on_event("startup")
+def start_resource_watcher():
+    resources.start()
 
-CATEGORY_MAP = load_category_keywords()
-MEMORY_MAP = load_memory()
+@app.on_event("startup")
+def fail_interrupted_jobs():
+    try:
+        failed = fail_stale_jobs()
+    except Exception as e:
+        print(f"⚠️ Could not check for interrupted ingest jobs: {e}")
+        return
+    if failed:
+        print(f"⚠️ Marked {failed} interrupted ingest jobs as failed")
+
+@app.on_event("shutdown")
+def stop_job_workers():
+    shutdown_jobs()
+    resources.stop()
+
+# ─── Request Metrics ────────────────────────────────────────────────
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    sampler = start_request_profile()
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        elapsed = time.perf_counter() - started
+        # The route template (/summary/{file_id}), not the raw path, keeps label cardinality bounded
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        metrics.REQUEST_SECONDS.observe(elapsed, method=request.method, route=route, status=str(status))
+        if sampler is not None:
+            finish_request_profile(sampler, f"{request.method} {route}", elapsed)
 
 # ─── Root ───────────────────────────────────────────────────────────
 @app.get("/")
@@ -49,228 +97,429 @@ def root():
     return {"message": "📦 Yanga Yanga API running!"}
 
 
-# ─── Get Recent Transactions ───────────────────────────────────────
+# ─── List Transactions ─────────────────────────────────────────────
+DEFAULT_LISTING_FIELDS = "id,file_id,details,amount,category,transaction_date,timestamp,needs_confirmation"
+
+
 @app.get("/transactions")
-def get_transactions(db: Session = Depends(get_db)):
-    latest_file_id = (
-        db.query(Transaction.file_id)
-        .order_by(desc(Transaction.timestamp))
-        .limit(1)
-        .scalar()
+async def get_transactions(
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    file_id: Optional[str] = Query(None, description="Defaults to the latest upload"),
+    all_files: bool = Query(False, description="List across every upload instead of the latest one"),
+    start: Optional[date] = Query(None),
+    end: Optional[date] = Query(None),
+    category: Optional[str] = Query(None),
+    min_amount: Optional[float] = Query(None),
+    max_amount: Optional[float] = Query(None),
+    needs_confirmation: Optional[bool] = Query(None),
+    fields: str = Query(DEFAULT_LISTING_FIELDS, description="Comma-separated columns to return"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    selected = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in selected if name not in LISTING_COLUMNS]
+    if unknown or not selected:
+        raise HTTPException(400, f"Unknown fields: {', '.join(unknown) or '(none given)'}")
+
+    if file_id is None and not all_files:
+        # Without a file_id the listing covers the latest upload only, as it
+        # always has; pass the returned file_id back when paging
+        file_id = (await db.execute(latest_file_query())).scalar()
+        if file_id is None:
+            return {"transactions": [], "next_cursor": None, "file_id": None}
+
+    filters = transaction_filters(
+        file_id, start, end, category, min_amount, max_amount, needs_confirmation
     )
-    if not latest_file_id:
-        return []
-    txns = db.query(Transaction).filter(Transaction.file_id == latest_file_id).all()
-    return [
-        {
-            "id": t.id,
-            "file_id": t.file_id,
-            "details": t.details,
-            "amount": t.amount,
-            "category": t.category,
-            "timestamp": t.timestamp.isoformat(),
-            "needs_confirmation": t.needs_confirmation
-        }
-        for t in txns
-    ]
+    try:
+        stmt = transaction_page(filters, selected, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    rows = (await db.execute(stmt)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].transaction_date, rows[-1].id)
+
+    def serialize(value):
+        return value.isoformat() if isinstance(value, datetime) else value
+
+    return {
+        "transactions": [
+            {name: serialize(getattr(row, name)) for name in selected}
+            for row in rows
+        ],
+        "next_cursor": next_cursor,
+        "file_id": file_id,
+    }
+
+
+# ─── Search Transactions ───────────────────────────────────────────
+@app.get("/transactions/search")
+def search_transactions_endpoint(
+    q: str = Query(..., min_length=1, description="Merchant or details text; misspellings are tolerated"),
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    file_id: Optional[str] = Query(None),
+    start: Optional[date] = Query(None),
+    end: Optional[date] = Query(None),
+    category: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+):
+    # A sync endpoint, so FastAPI runs it in the threadpool: the SQLite
+    # fallback builds and scores its trigram index in Python, which must
+    # not happen on the event loop
+    filters = transaction_filters(file_id, start, end, category)
+    rows = search_transactions(db, q.strip(), filters, limit, offset)
+
+    next_offset = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_offset = offset + limit
+
+    return {
+        "results": [
+            {**row, "transaction_date": row["transaction_date"].isoformat(), "rank": round(float(row["rank"]), 4)}
+            for row in rows
+        ],
+        "next_offset": next_offset
+    }
 
 
 # ─── Upload Transactions ───────────────────────────────────────────
-@app.post("/transactions", response_model=TransactionUploadResponse)
-async def upload_transactions(*, file: UploadFile = File(...), db: Session = Depends(get_db)) -> TransactionUploadResponse:
+def _ingest_upload(file_id: str, file_path: str, categorized_path: str, file_hash: str, size_bytes: int) -> dict:
+    """
+    Run the (CPU-bound, blocking) ingest pipeline with its own sync session.
+    Called through the threadpool so the event loop stays free.
+    """
+    from backend.utils.ingest import ingest_csv
+
+    res = resources.current()
+    db = SessionLocal()
     try:
-        file_id = str(uuid.uuid4())
-        file_path = os.path.join(UPLOAD_DIR, f"{file_id}.csv")
-
-        with open(file_path, "wb") as f:
-            f.write(await file.read())
-
-        df = pd.read_csv(file_path)
-
-        if "Details" not in df.columns or "Amount (MWK)" not in df.columns:
-            raise HTTPException(400, "CSV must have 'Details' and 'Amount (MWK)' columns.")
-
-        df["Details"] = df["Details"].astype(str).str.strip()
-        df["Amount (MWK)"] = (
-            df["Amount (MWK)"].astype(str)
-            .str.replace(",", "")
-            .str.replace("K", "000")
+        stats = ingest_csv(
+            db, file_path, categorized_path, file_id,
+            load_memory(), res.category_map, res.model, res.vectorizer,
+            file_hash=file_hash,
         )
-        df["Amount (MWK)"] = pd.to_numeric(df["Amount (MWK)"], errors='coerce')
-
-        def parse_date(row):
-            try:
-                return datetime.strptime(f"{row['Date']} {row['Time']}", "%d/%m/%y %I:%M %p")
-            except:
-                return pd.NaT
-
-        df["transaction_date"] = df.apply(parse_date, axis=1)
-        df["Timestamp"] = df["transaction_date"]
-        df = df.dropna(subset=["transaction_date", "Details", "Amount (MWK)"])
-
-        df = apply_memory(df, MEMORY_MAP)
-
-        df["Category"] = df.apply(
-            lambda row: row["Category"]
-            if pd.notna(row.get("Category")) and row["Category"] != ""
-            else auto_categorize(str(row["Details"]), CATEGORY_MAP),
-            axis=1
-        )
-
-        def final_categorize(row):
-            cat = row["Category"]
-            if pd.isna(cat) or cat == "" or cat == "Uncategorized":
-                return predict_category(model, vectorizer, str(row["Details"]))
-            return cat
+        record_uploaded_file(db, file_hash, file_id, size_bytes, stats)
+        with metrics.StageTimer("commit"):
+            db.commit()
+        return stats
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
 
-        df["Category"] = df.apply(final_categorize, axis=1)
 
-        ambiguous_keywords = ["withdraw", "agent", "transfer", "peer"]
-        df["Needs_Confirmation"] = df["Details"].str.lower().apply(
-            lambda detail: any(kw in detail for kw in ambiguous_keywords)
-        )
-
-        # ✅ Save categorized version of the file
-        categorized_path = os.path.join(UPLOAD_DIR, f"{file_id}_categorized.csv")
-        df.to_csv(categorized_path, index=False)
-
-        added_count = 0
-        for index, row in df.iterrows():
-            existing = db.query(Transaction).filter(
-                Transaction.details == row["Details"],
-                Transaction.amount == row["Amount (MWK)"],
-                Transaction.transaction_date == row["transaction_date"]
-            ).first()
+@app.post("/transactions", response_model=TransactionUploadResponse)
+async def upload_transactions(
+    *,
+    file: UploadFile = File(...),
+    background: bool = Query(False, description="Queue the file and return a job id immediately"),
+    db: AsyncSession = Depends(get_async_db),
+) -> TransactionUploadResponse:
+    from backend.utils.ingest import spool_upload
 
-            if existing:
-                continue
+    try:
+        file_id = str(uuid.uuid4())
+        file_path = os.path.join(UPLOAD_DIR, f"{file_id}.csv")
+        categorized_path = artifact_path(UPLOAD_DIR, file_id)
+
+        size_bytes, file_hash = await spool_upload(file, file_path)
+
+        # Same bytes as a statement we already ingested: hand back that result
+        prior = await db.get(UploadedFile, file_hash)
+        # End the read so its pooled connection is not held (idle in
+        # transaction) while the synchronous ingest runs on its own session
+        if prior and not prior.rows_stored and find_artifact(UPLOAD_DIR, prior.file_id) is None:
+            # Recorded before empty uploads were skipped: nothing to hand back
+            await db.delete(prior)
+            prior = None
+        await db.commit()
+        if prior:
+            os.remove(file_path)
+            return TransactionUploadResponse(
+                message=f"This statement was already uploaded; {prior.rows_added} transactions were stored then.",
+                file_id=prior.file_id,
+                rows_dropped=prior.rows_processed - prior.rows_stored,
+                already_uploaded=True
+            )
 
-            txn = Transaction(
+        if background:
+            job_id = str(uuid.uuid4())
+            db.add(IngestJob(id=job_id, file_id=file_id, status="queued"))
+            await db.commit()
+            submit_ingest_job(job_id, file_id, file_path, categorized_path, file_hash, size_bytes)
+            return TransactionUploadResponse(
+                message="Upload queued for processing.",
                 file_id=file_id,
-                details=row["Details"],
-                amount=row["Amount (MWK)"],
-                category=row["Category"],
-                timestamp=row["Timestamp"],
-                transaction_date=row["transaction_date"],
-                needs_confirmation=row["Needs_Confirmation"]
+                job_id=job_id
             )
-            db.add(txn)
-            added_count += 1
 
-        db.commit()
+        try:
+            stats = await run_in_threadpool(
+                _ingest_upload, file_id, file_path, categorized_path, file_hash, size_bytes
+            )
+        except ValueError as e:
+            raise HTTPException(400, str(e))
+        added_count = stats["added"]
+        response_cache.invalidate(file_id)
 
         return TransactionUploadResponse(
             message=f"Uploaded and stored {added_count} transactions (deduplicated).",
-            file_id=file_id
+            file_id=file_id,
+            rows_dropped=stats["dropped"]
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal Server Error: {e}")
 
 
+# ─── Cache Stats ────────────────────────────────────────────────────
+@app.get("/stats/cache")
+def cache_stats():
+    return response_cache.stats()
+
+
+# ─── Connection Pool Stats ──────────────────────────────────────────
+@app.get("/stats/pool")
+def connection_pool_stats():
+    return pool_stats()
+
+
+# ─── Prometheus Metrics ─────────────────────────────────────────────
+def _collect_cache_and_pool_metrics() -> list:
+    cache = response_cache.stats()
+    matcher = matcher_cache_info()
+    families = [
+        ("yanga_response_cache_lookups_total", "counter", "Response cache lookups by result.",
+         [({"result": "hit"}, cache["hits"]), ({"result": "miss"}, cache["misses"])]),
+        ("yanga_response_cache_hit_ratio", "gauge", "Share of response cache lookups that hit.",
+         [({}, cache["hit_ratio"])]),
+        ("yanga_response_cache_entries", "gauge", "Entries in the response cache.", [({}, cache["size"])]),
+        ("yanga_response_cache_evictions_total", "counter", "Entries evicted to stay under maxsize.",
+         [({}, cache["evictions"])]),
+        ("yanga_keyword_matcher_cache_lookups_total", "counter", "Compiled keyword matcher cache lookups.",
+         [({"result": "hit"}, matcher.hits), ({"result": "miss"}, matcher.misses)]),
+        ("yanga_memory_store_reloads_total", "counter", "Category memory reloads from the database.",
+         [({}, memory_store.reloads)]),
+    ]
+    pools = pool_stats()
+    for name, kind, key in (
+        ("yanga_db_pool_checkouts_total", "counter", "checkouts"),
+        ("yanga_db_pool_timeouts_total", "counter", "timeouts"),
+        ("yanga_db_pool_overflow_events_total", "counter", "overflow_events"),
+        ("yanga_db_pool_wait_seconds_total", "counter", "wait_seconds_total"),
+        ("yanga_db_pool_wait_seconds_max", "gauge", "wait_seconds_max"),
+        ("yanga_db_pool_checked_out", "gauge", "checked_out"),
+    ):
+        samples = [({"pool": pool}, stats[key]) for pool, stats in pools.items() if key in stats]
+        families.append((name, kind, f"Connection pool {key.replace('_', ' ')}.", samples))
+    return families
+
+
+metrics.register_collector(_collect_cache_and_pool_metrics)
+
+
+@app.get("/metrics")
+def prometheus_metrics():
+    return Response(content=metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+# ─── Readiness ──────────────────────────────────────────────────────
+@app.get("/ready")
+def readiness():
+    body = {
+        "ready": resources.ready,
+        "warmup_seconds": resources.warmup_seconds,
+        "error": resources.warmup_error,
+    }
+    return JSONResponse(content=body, status_code=200 if resources.ready else 503)
+
+
+# ─── Active Resource Versions ───────────────────────────────────────
+@app.get("/resources")
+def resource_versions():
+    return resources.versions()
+
+
+# ─── Ingest Job Status ──────────────────────────────────────────────
+@app.get("/jobs/{job_id}", response_model=IngestJobResponse)
+async def get_job(job_id: str, db: AsyncSession = Depends(get_async_db)) -> IngestJobResponse:
+    job = await db.get(IngestJob, job_id)
+    if not job:
+        raise HTTPException(404, "Job not found.")
+    if is_stale(job):
+        # Its worker went away without recording an outcome
+        job.status = "failed"
+        job.error = "The job stopped reporting progress; its worker or the server was restarted."
+        await db.commit()
+    if job.status == "completed":
+        # The job ran in another process; drop anything cached while it was running
+        response_cache.invalidate(job.file_id)
+    return IngestJobResponse(
+        job_id=job.id,
+        file_id=job.file_id,
+        status=job.status,
+        rows_processed=job.rows_processed,
+        rows_stored=job.rows_stored,
+        rows_added=job.rows_added,
+        rows_skipped=job.rows_skipped,
+        rows_dropped=job.rows_processed - job.rows_stored,
+        error=job.error,
+        created_at=job.created_at,
+        updated_at=job.updated_at
+    )
+
+
 # ─── Uncategorized Rows ─────────────────────────────────────────────
 @app.get("/uncategorized/{file_id}")
 def get_uncategorized(file_id: str):
-    path = os.path.join(UPLOAD_DIR, f"{file_id}_categorized.csv")
-    if not os.path.exists(path):
+    path = find_artifact(UPLOAD_DIR, file_id)
+    if path is None:
         raise HTTPException(404, "Categorized file not found.")
-    df = pd.read_csv(path)
+    from backend.utils.storage import read_artifact
+
+    df = read_artifact(path, columns=["Details", "Amount (MWK)", "Category"])
     unc = df[df["Category"].isnull()][["Details", "Amount (MWK)"]]
     return JSONResponse(content=unc.to_dict(orient="records"))
 
 
 # ─── Manual Category Update ─────────────────────────────────────────
 @app.post("/categorize/{file_id}")
-def update_categories(file_id: str, corrections: Dict[str, str] = Body(...)):
-    path = os.path.join(UPLOAD_DIR, f"{file_id}_categorized.csv")
-    if not os.path.exists(path):
+def update_categories(
+    file_id: str,
+    corrections: Dict[str, str] = Body(...),
+    propagate: bool = Query(False, description="Also recategorize matching transactions in every other file"),
+    db: Session = Depends(get_db),
+):
+    known = db.query(Transaction.id).filter(Transaction.file_id == file_id).first() is not None
+    if not known and find_artifact(UPLOAD_DIR, file_id) is None:
         raise HTTPException(404, "File not found.")
-    df = pd.read_csv(path)
-    for i, row in df.iterrows():
-        if row["Details"] in corrections:
-            df.at[i, "Category"] = corrections[row["Details"]]
-    update_memory(df, MEMORY_MAP)
-    df.to_csv(path, index=False)
-    return {"message": "Manual categories applied and memory updated."}
+
+    # Rejected before anything is written: an over-long category would fail
+    # the UPDATE on Postgres, and the memory store would silently truncate it
+    max_length = Transaction.category.type.length
+    corrections = {detail: str(category).strip() for detail, category in corrections.items()}
+    invalid = sorted(detail for detail, category in corrections.items()
+                     if not category or len(category) > max_length)
+    if invalid:
+        raise HTTPException(422, f"Categories must be 1-{max_length} characters; invalid for: {', '.join(invalid)}")
+
+    # Transactions, rollups and memory change in one transaction; the
+    # artifacts are rewritten only after that commit succeeds
+    changed = apply_category_corrections(db, None if propagate else file_id, corrections)
+    learned = memory_store.upsert(corrections, db=db)
+    if changed:
+        refresh_rollups(db, list(changed))
+    db.commit()
+    memory_store.invalidate()
+
+    from backend.utils.storage import correct_artifact
+
+    for changed_file in {file_id, *changed}:
+        response_cache.invalidate(changed_file)
+        path = find_artifact(UPLOAD_DIR, changed_file)
+        if path is None:
+            continue
+        try:
+            correct_artifact(path, corrections)
+        except Exception as e:
+            # The database is the source of truth; a stale artifact only affects /uncategorized
+            print(f"⚠️ Could not update {path}: {e}")
+
+    return {
+        "message": "Manual categories applied and memory updated.",
+        "rows_changed": sum(changed.values()),
+        "files_changed": len(changed),
+        "memory_entries_updated": learned,
+    }
 
 
 # ─── Summary ────────────────────────────────────────────────────────
 @app.get("/summary/{file_id}")
 def get_summary(file_id: str):
-    path = os.path.join(UPLOAD_DIR, f"{file_id}_categorized.csv")
-    if not os.path.exists(path):
-        raise HTTPException(status_code=404, detail=f"File not found at {path}")
-    return {"message": f"File found: {path}"}
+    key = ("file_summary", file_id)
+    cached = response_cache.get(key)
+    if cached is not MISSING:
+        return cached
+    path = find_artifact(UPLOAD_DIR, file_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"File not found for {file_id}")
+    response = {"message": f"File found: {path}"}
+    response_cache.set(key, response)
+    return response
 
 
 # ─── Dashboard ──────────────────────────────────────────────────────
-@app.get("/dashboard/{file_id}")
-def get_dashboard(file_id: str):
-    path = os.path.join(UPLOAD_DIR, f"{file_id}_categorized.csv")
-    if not os.path.exists(path):
+def _compute_summary(db: Session, file_id: str, start: Optional[date], end: Optional[date]) -> dict:
+    # Whole-file summaries come from the rollup table; date ranges need the raw rows
+    if start is None and end is None:
+        return rollup_summary(db, file_id)
+    filters = transaction_filters(file_id, start, end)
+    summary = spending_summary(db, filters)
+    summary["monthly_trends"] = monthly_trends(db, filters)
+    return summary
+
+
+async def _file_summary(db: AsyncSession, file_id: str, start: Optional[date] = None, end: Optional[date] = None) -> dict:
+    key = ("spending_summary", file_id, start, end)
+    cached = response_cache.get(key)
+    if cached is not MISSING:
+        return cached
+
+    summary = await db.run_sync(_compute_summary, file_id, start, end)
+    if not summary["count"] and find_artifact(UPLOAD_DIR, file_id) is None:
         raise HTTPException(404, "File not found.")
+    response_cache.set(key, summary)
+    return summary
 
-    df = pd.read_csv(path)
-
-    # Ensure Amount column is numeric
-    df['Amount (MWK)'] = (
-        df['Amount (MWK)']
-        .astype(str)
-        .str.replace(",", "")
-        .str.replace("K", "000")
-    )
-    df['Amount (MWK)'] = pd.to_numeric(df['Amount (MWK)'], errors='coerce')
-    df.dropna(subset=['Amount (MWK)'], inplace=True)
-
-    df['Category'] = df['Category'].fillna("Uncategorized")
-
-    # Compute total income (positive values) and total spent (negative values, made positive)
-    df['is_income'] = df['Amount (MWK)'] > 0
-    total_income = df[df['is_income']]['Amount (MWK)'].sum()
-    total_spent = df[~df['is_income']]['Amount (MWK)'].abs().sum()
-
-    # Group category breakdown by spending only
-    spending_df = df[~df['is_income']].copy()
-    spending_df['Amount (MWK)'] = spending_df['Amount (MWK)'].abs()
-
-    breakdown = spending_df.groupby('Category')['Amount (MWK)'].sum().reset_index()
-    breakdown['Percentage'] = round((breakdown['Amount (MWK)'] / total_spent) * 100, 2)
-
-    # Optional: Get monthly trend data
-    df['Month'] = pd.to_datetime(df['Timestamp'], errors='coerce').dt.to_period('M').astype(str)
-    monthly_trend = (
-        df.groupby(['Month'])
-        .agg({
-            'Amount (MWK)': 'sum'
-        })
-        .reset_index()
-        .rename(columns={'Amount (MWK)': 'Net Amount'})
-    )
 
+@app.get("/dashboard/{file_id}")
+async def get_dashboard(
+    file_id: str,
+    start: Optional[date] = Query(None, description="Only include transactions on or after this date"),
+    end: Optional[date] = Query(None, description="Only include transactions on or before this date"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    summary = await _file_summary(db, file_id, start, end)
     return JSONResponse(content={
-        "total_income": round(float(total_income), 2),
-        "total_spent": round(float(total_spent), 2),
-        "category_breakdown": breakdown.to_dict(orient="records"),
-        "monthly_trends": monthly_trend.to_dict(orient="records")
+        "total_income": round(summary["total_income"], 2),
+        "total_spent": round(summary["total_spent"], 2),
+        "transaction_count": summary["count"],
+        "categories": summary["categories"],
+        "category_breakdown": summary["category_breakdown"],
+        "monthly_trends": summary["monthly_trends"]
     })
 
 # ─── Export PDF ─────────────────────────────────────────────────────
 @app.get("/export/pdf/{file_id}")
-def export_pdf(file_id: str):
-    path = os.path.join(UPLOAD_DIR, f"{file_id}_categorized.csv")
-    if not os.path.exists(path):
-        raise HTTPException(404, "File not found.")
-    df = pd.read_csv(path)
-    df["Category"] = df["Category"].fillna("Uncategorized")
-    total_income = df[df["Amount (MWK)"] > 0]["Amount (MWK)"].sum()
-    spent = df[df["Amount (MWK)"] < 0].copy()
-    spent["Amount (MWK)"] = spent["Amount (MWK)"].abs()
-    total_spent = spent["Amount (MWK)"].sum()
-    summary = spent.groupby("Category")["Amount (MWK)"].sum().reset_index()
-    summary["Percentage"] = (summary["Amount (MWK)"] / total_spent * 100).round(2)
-    pdf_path = os.path.join(UPLOAD_DIR, f"{file_id}_report.pdf")
-    generate_pdf_report(summary.to_dict(orient="records"), total_income, total_spent, pdf_path)
-    return FileResponse(pdf_path, media_type="application/pdf", filename=f"YangaYanga_Report_{file_id}.pdf")
+async def export_pdf(
+    file_id: str,
+    start: Optional[date] = Query(None),
+    end: Optional[date] = Query(None),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    summary = await _file_summary(db, file_id, start, end)
+    args = (summary["category_breakdown"], summary["total_income"], summary["total_spent"])
+
+    etag = f'"{report_digest(*args)}"'
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    pdf_path = await asyncio.wrap_future(ensure_report(*args, REPORTS_DIR))
+    return FileResponse(
+        pdf_path,
+        media_type="application/pdf",
+        filename=f"YangaYanga_Report_{file_id}.pdf",
+        headers={"ETag": etag}
+    )
 
 
 # ─── WhatsApp Share ─────────────────────────────────────────────────
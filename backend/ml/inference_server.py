@@ -0,0 +1,203 @@
+# backend/ml/inference_server.py
+#
+# Shared model process for all uvicorn and ingest workers:
+#
+#     INFERENCE_SOCKET=/tmp/yanga-inference.sock python -m backend.ml.inference_server
+#
+# Start the API with the same INFERENCE_SOCKET and its workers stop loading
+# their own model copy; predict_category / predict_categories keep their
+# signatures and route here when called with model=None.
+#
+# Messages are JSON over multiprocessing.connection's byte framing
+# (send_bytes/recv_bytes), never pickles, so a peer cannot make the server
+# run code. The socket is created owner-only; INFERENCE_AUTHKEY adds a
+# shared-secret handshake on top.
+
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing.connection import Client, Listener
+
+from backend.config import (
+    INFERENCE_AUTHKEY, INFERENCE_BATCH_WINDOW_MS, INFERENCE_MAX_BATCH, INFERENCE_SOCKET,
+)
+from backend.ml.model_utils import predict_categories
+
+
+class Batcher:
+    """
+    Merges prediction requests from every connection into one model call.
+    The first request opens a window of `window_ms`; anything arriving
+    before it closes (up to `max_batch` texts) joins the same batch, and
+    each distinct text is predicted once.
+    """
+
+    def __init__(self, resources, window_ms: float = INFERENCE_BATCH_WINDOW_MS,
+                 max_batch: int = INFERENCE_MAX_BATCH):
+        self.resources = resources
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self.batches = 0
+        self.requests = 0
+        self.texts = 0
+        self._thread = threading.Thread(target=self._run, name="inference-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, texts: list) -> Future:
+        future = Future()
+        self._queue.put((texts, future))
+        return future
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            size = len(batch[0][0])
+            deadline = time.monotonic() + self.window
+            while size < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(item)
+                size += len(item[0])
+            self._predict(batch)
+
+    def _predict(self, batch: list):
+        unique = list(dict.fromkeys(text for texts, _ in batch for text in texts))
+        try:
+            res = self.resources.current()
+            predictions = dict(zip(unique, predict_categories(res.model, res.vectorizer, unique)))
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for texts, future in batch:
+            future.set_result([str(predictions[text]) for text in texts])
+        self.batches += 1
+        self.requests += len(batch)
+        self.texts += len(unique)
+
+
+def _send(conn, message):
+    conn.send_bytes(json.dumps(message).encode("utf-8"))
+
+
+def _recv(conn):
+    return json.loads(conn.recv_bytes().decode("utf-8"))
+
+
+def _serve_connection(conn, batcher: Batcher):
+    with conn:
+        while True:
+            try:
+                texts = _recv(conn)
+            except (EOFError, OSError):
+                return
+            except ValueError as e:
+                _send(conn, ["error", f"Malformed request: {e}"])
+                continue
+            if not isinstance(texts, list):
+                _send(conn, ["error", "Expected a JSON list of texts"])
+                continue
+            try:
+                _send(conn, ["ok", batcher.submit([str(text) for text in texts]).result()])
+            except Exception as e:
+                _send(conn, ["error", str(e)])
+
+
+def serve(address: str = INFERENCE_SOCKET, authkey: bytes = INFERENCE_AUTHKEY):
+    """Load the model once and answer prediction requests on a Unix socket until killed."""
+    from backend.utils.resources import ResourceManager
+
+    if not address:
+        raise SystemExit("Set INFERENCE_SOCKET to the Unix socket path to listen on.")
+    if os.path.exists(address):
+        os.unlink(address)  # left behind by a previous run
+
+    # Bind with an owner-only umask so the socket is never reachable by
+    # other local users, not even between bind() and a later chmod
+    old_umask = os.umask(0o077)
+    try:
+        listener = Listener(address, family="AF_UNIX", authkey=authkey)
+    finally:
+        os.umask(old_umask)
+
+    resources = ResourceManager(load_models=True)
+    resources.warmup()
+    resources.start()  # keep watching model.pkl / vectorizer.pkl for retrains
+    batcher = Batcher(resources)
+
+    with listener:
+        print(f"🧠 Inference server listening on {address}")
+        while True:
+            try:
+                conn = listener.accept()
+            except Exception as e:
+                print(f"⚠️ Rejected inference connection: {e}")
+                continue
+            threading.Thread(target=_serve_connection, args=(conn, batcher), daemon=True).start()
+
+
+class InferenceClient:
+    """
+    Client for the inference server. Each thread keeps its own connection,
+    and a dropped connection (server restart) is retried once.
+    """
+
+    def __init__(self, address: str = INFERENCE_SOCKET, authkey: bytes = INFERENCE_AUTHKEY):
+        self.address = address
+        self.authkey = authkey
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = Client(self.address, family="AF_UNIX", authkey=self.authkey)
+            self._local.conn = conn
+        return conn
+
+    def _reset(self):
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None:
+            try:
+                conn.close()
+            except OSError:
+                pass
+
+    def predict(self, texts) -> list:
+        texts = [str(text) for text in texts]
+        for attempt in range(2):
+            try:
+                conn = self._connection()
+                _send(conn, texts)
+                status, payload = _recv(conn)
+                break
+            except (EOFError, OSError):
+                self._reset()
+                if attempt:
+                    raise
+        if status != "ok":
+            raise RuntimeError(f"Inference server error: {payload}")
+        return payload
+
+
+_client = None
+
+
+def get_client() -> InferenceClient:
+    global _client
+    if _client is None:
+        _client = InferenceClient()
+    return _client
+
+
+if __name__ == "__main__":
+    serve()
@@ -1,16 +1,19 @@
-import joblib
 import os
 
+from backend.config import INFERENCE_SOCKET, ML_BATCH_SIZE
+from backend.utils import metrics
+
 # This file is in backend/ml/, so go one level up to get to backend/
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__)))
 
 MODEL_PATH = os.path.join(BASE_DIR, "model.pkl")
 VEC_PATH = os.path.join(BASE_DIR, "vectorizer.pkl")
 
-print(f"[DEBUG] Loading model from: {MODEL_PATH}")
-print(f"[DEBUG] Loading vectorizer from: {VEC_PATH}")
-
 def load_model():
+    # joblib (and the sklearn classes it unpickles) is imported here, not at
+    # module import, so the API can start serving before the model is needed
+    import joblib
+
     if not os.path.exists(MODEL_PATH):
         raise FileNotFoundError(f"Model file not found at {MODEL_PATH}")
     if not os.path.exists(VEC_PATH):
@@ -20,6 +23,62 @@ def load_model():
     vectorizer = joblib.load(VEC_PATH)
     return model, vectorizer
 
+def _predict_rows(model, vectorizer, texts):
+    """
+    Predict texts one by one after their batch failed. Rows that still fail
+    become "Uncategorized"; returns (predictions, failed row count, first error).
+    """
+    predictions, failed, first_error = [], 0, None
+    for text in texts:
+        try:
+            predictions.append(model.predict(vectorizer.transform([text]))[0])
+        except Exception as e:
+            predictions.append("Uncategorized")
+            failed += 1
+            first_error = first_error or e
+    return predictions, failed, first_error
+
+# Model loaded in-process only if the inference server cannot be reached
+_fallback = {}
+
+def _predict_remote(texts):
+    from backend.ml.inference_server import get_client
+
+    try:
+        return get_client().predict(texts)
+    except Exception as e:
+        print(f"⚠️ Inference server unavailable, predicting locally: {e}")
+    if "model" not in _fallback:
+        _fallback["model"], _fallback["vectorizer"] = load_model()
+    return predict_categories(_fallback["model"], _fallback["vectorizer"], texts)
+
+def predict_categories(model, vectorizer, texts, chunk_size=ML_BATCH_SIZE):
+    """
+    Predict categories for many texts at once. Each chunk of `chunk_size`
+    texts is transformed into one sparse matrix and predicted in one call;
+    if a chunk fails, its rows are retried one by one and any row that
+    still fails becomes "Uncategorized".
+    Called with model=None while INFERENCE_SOCKET is set, the texts are sent
+    to the shared inference server instead.
+    """
+    texts = [str(text) for text in texts]
+    if model is None and INFERENCE_SOCKET:
+        metrics.ML_BATCH_ROWS.observe(len(texts), mode="remote")
+        return _predict_remote(texts)
+    predictions = []
+    for start in range(0, len(texts), chunk_size):
+        chunk = texts[start:start + chunk_size]
+        metrics.ML_BATCH_ROWS.observe(len(chunk), mode="local")
+        try:
+            predictions.extend(model.predict(vectorizer.transform(chunk)))
+        except Exception as e:
+            metrics.ML_BATCH_FAILURES.inc()
+            retried, failed, first_error = _predict_rows(model, vectorizer, chunk)
+            predictions.extend(retried)
+            # One line per failed batch, however many of its rows fail
+            summary = f"{failed} still failed (first: {first_error})" if failed else "all recovered"
+            print(f"⚠️ Batch prediction failed for {len(chunk)} rows ({e}); retried per row, {summary}")
+    return predictions
+
 def predict_category(model, vectorizer, text):
-    vec = vectorizer.transform([text])
-    return model.predict(vec)[0]
+    return predict_categories(model, vectorizer, [text])[0]
@@ -0,0 +1,17 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+class IngestJobResponse(BaseModel):
+    job_id: str
+    file_id: str
+    status: str
+    rows_processed: int
+    rows_stored: int
+    rows_added: int
+    rows_skipped: int
+    rows_dropped: int
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
@@ -1,5 +1,5 @@
 from ..db.db import Base
-from sqlalchemy import Column, Integer, String, Float, DateTime, Index
+from sqlalchemy import Column, Integer, String, Float, DateTime, Index, UniqueConstraint, func
 from datetime import datetime
 from sqlalchemy import Boolean  # Add at the top if miss
 
@@ -10,7 +10,7 @@ class Transaction(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     file_id = Column(String, index=True)  # For backward compatibility
-    file_hash = Column(String(32), unique=True, index=True)  # MD5 hash length is 32
+    file_hash = Column(String(32), index=True)  # MD5 hash length is 32
     details = Column(String(255), nullable=False)  # Increased length and made non-nullable
     amount = Column(Float, nullable=False)
     category = Column(String(50), nullable=True)
@@ -23,6 +23,12 @@ class Transaction(Base):
     __table_args__ = (
         Index('idx_file_category', 'file_hash', 'category'),
         Index('idx_date_amount', 'transaction_date', 'amount'),
+        Index('idx_file_date_id', 'file_id', 'transaction_date', 'id'),
+        Index('idx_date_id', 'transaction_date', 'id'),
+        Index('idx_category_date_id', 'category', 'transaction_date', 'id'),
+        Index('idx_file_id_category', 'file_id', 'category'),
+        Index('idx_details_normalized', func.lower(func.trim(details))),
+        UniqueConstraint('details', 'amount', 'transaction_date', name='uq_transactions_natural_key'),
         {'extend_existing': True} 
     )
 
@@ -1,5 +1,10 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 class TransactionUploadResponse(BaseModel):
     message: str
     file_id: str
+    job_id: Optional[str] = None
+    rows_dropped: Optional[int] = None
+    already_uploaded: bool = False
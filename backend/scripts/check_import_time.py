@@ -0,0 +1,74 @@
+import os
+import subprocess
+import sys
+
+from backend.config import IMPORT_TIME_BUDGET_MS
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+RUNS = int(os.getenv("IMPORT_TIME_RUNS", "5"))
+
+# Must not be imported just by starting the API; they load on first use / warmup
+DEFERRED_MODULES = ("pandas", "numpy", "joblib", "sklearn", "fpdf")
+
+_PROBE = """
+import sys, time
+started = time.perf_counter()
+import backend.main
+elapsed = (time.perf_counter() - started) * 1000
+loaded = [m for m in {deferred!r} if m in sys.modules]
+print(f"{{elapsed:.1f}} {{','.join(loaded)}}")
+"""
+
+
+def measure_once() -> tuple:
+    """Import backend.main in a fresh interpreter; return (ms, eagerly loaded heavy modules)."""
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(deferred=DEFERRED_MODULES)],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    ).stdout.strip().splitlines()[-1]
+    elapsed, _, loaded = out.partition(" ")
+    return float(elapsed), [m for m in loaded.split(",") if m]
+
+
+def slowest_imports(limit: int = 10) -> list:
+    """Top modules by cumulative import time, from python -X importtime."""
+    err = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import backend.main"],
+        cwd=REPO_ROOT, capture_output=True, text=True,
+    ).stderr
+    rows = []
+    for line in err.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            rows.append((int(parts[1]), parts[2].strip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main():
+    timings = []
+    eager = set()
+    for _ in range(RUNS):
+        elapsed, loaded = measure_once()
+        timings.append(elapsed)
+        eager.update(loaded)
+    best = min(timings)
+    median = sorted(timings)[len(timings) // 2]
+    print(f"⏱️ import backend.main: best {best:.0f} ms, median {median:.0f} ms "
+          f"over {RUNS} runs (budget {IMPORT_TIME_BUDGET_MS:.0f} ms)")
+
+    failed = False
+    if eager:
+        print(f"❌ Imported eagerly, should be deferred: {', '.join(sorted(eager))}")
+        failed = True
+    if median > IMPORT_TIME_BUDGET_MS:
+        print("❌ Over budget. Slowest imports (cumulative µs):")
+        for micros, module in slowest_imports():
+            print(f"   {micros:>9}  {module}")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("✅ Within budget.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import argparse
+import glob
+import os
+
+import pandas as pd
+
+from backend.utils.categorization import needs_confirmation
+from backend.utils.ingest import parse_dates
+from backend.utils.storage import HAS_PYARROW, read_artifact, write_artifact
+
+UPLOAD_DIR = os.path.join(os.path.dirname(__file__), "..", "uploads")
+
+
+def normalize_legacy(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Bring an older categorized CSV up to the current artifact columns:
+    numeric amounts, a parsed transaction_date and Needs_Confirmation.
+    """
+    if df["Amount (MWK)"].dtype == object:
+        df["Amount (MWK)"] = pd.to_numeric(
+            df["Amount (MWK)"].astype(str).str.replace(",", "").str.replace("K", "000"),
+            errors="coerce",
+        )
+    if "transaction_date" not in df.columns and {"Date", "Time"} <= set(df.columns):
+        df["transaction_date"] = parse_dates(df)
+    if "Needs_Confirmation" not in df.columns:
+        df["Needs_Confirmation"] = needs_confirmation(df["Details"])
+    return df
+
+
+def convert(csv_path: str, remove_csv: bool = False) -> int:
+    """Write the Parquet twin of one categorized CSV and verify it. Returns its row count."""
+    parquet_path = csv_path[:-len(".csv")] + ".parquet"
+    df = normalize_legacy(pd.read_csv(csv_path))
+    write_artifact(df, parquet_path)
+
+    written = len(read_artifact(parquet_path, columns=["Details"]))
+    if written != len(df):
+        os.remove(parquet_path)
+        raise RuntimeError(f"{parquet_path} has {written} rows, expected {len(df)}")
+    if remove_csv:
+        os.remove(csv_path)
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert categorized upload CSVs to typed Parquet.")
+    parser.add_argument("--upload-dir", default=UPLOAD_DIR)
+    parser.add_argument("--remove-csv", action="store_true",
+                        help="delete each CSV once its Parquet copy is verified")
+    parser.add_argument("--force", action="store_true",
+                        help="re-convert files that already have a Parquet copy")
+    args = parser.parse_args(argv)
+    if not HAS_PYARROW:
+        parser.error("pyarrow is not installed; artifacts will stay CSV")
+
+    paths = sorted(glob.glob(os.path.join(args.upload_dir, "*_categorized.csv")))
+    print(f"🔄 Converting {len(paths)} categorized CSVs in {os.path.abspath(args.upload_dir)}...")
+    converted = skipped = failed = 0
+    for path in paths:
+        if not args.force and os.path.exists(path[:-len(".csv")] + ".parquet"):
+            skipped += 1
+            continue
+        try:
+            rows = convert(path, args.remove_csv)
+            converted += 1
+            print(f"   ✅ {os.path.basename(path)}: {rows} rows")
+        except Exception as e:
+            failed += 1
+            print(f"   ❌ {os.path.basename(path)}: {e}")
+    print(f"✅ Done. {converted} converted, {skipped} already converted, {failed} failed.")
+
+
+if __name__ == "__main__":
+    main()
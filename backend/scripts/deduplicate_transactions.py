@@ -1,57 +1,147 @@
+import argparse
+import sys
+from array import array
+
+from sqlalchemy import delete, func, select
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+
 from backend.db.db import SessionLocal
-from backend.db.models import Transaction
+from backend.db.models import NATURAL_KEY, Transaction
+from backend.db.rollups import refresh_rollups
+
+DEFAULT_BATCH_SIZE = 5000
+
+
+def key_columns(key: str) -> list:
+    """Resolve a comma-separated column list like "details,amount,transaction_date"."""
+    names = [name.strip() for name in key.split(",") if name.strip()]
+    unknown = [name for name in names if name not in Transaction.__table__.columns]
+    if not names or unknown:
+        raise ValueError(f"Unknown dedup key column(s): {', '.join(unknown) or key!r}")
+    return [Transaction.__table__.columns[name] for name in names]
+
+
+def ranked_transactions(columns: list):
+    """Every transaction numbered within its key group, oldest (lowest id) first."""
+    return select(
+        Transaction.id,
+        Transaction.file_id,
+        func.row_number().over(partition_by=columns, order_by=Transaction.id).label("rn"),
+    ).subquery()
+
+
+def report_duplicates(db: Session, columns: list, show: int) -> None:
+    """Dry run: print each duplicated key with how many copies it has."""
+    copies = func.count(Transaction.id).label("copies")
+    groups = (
+        select(*columns, copies)
+        .group_by(*columns)
+        .having(func.count(Transaction.id) > 1)
+        .subquery()
+    )
+    total_groups, extra_rows = db.execute(
+        select(func.count(), func.coalesce(func.sum(groups.c.copies - 1), 0))
+    ).one()
+    print(f"🔍 {total_groups} duplicated keys, {extra_rows} rows would be deleted.")
+
+    query = select(groups).order_by(groups.c.copies.desc())
+    if show:
+        query = query.limit(show)
+    for row in db.execute(query):
+        *key, count = row
+        print(f"   {count:>6} × {tuple(key)}")
+    if show and total_groups > show:
+        print(f"   … {total_groups - show} more (use --show 0 to list all)")
 
 
-def delete_duplicate_transactions():
+def delete_duplicate_transactions(key: str = ",".join(NATURAL_KEY), batch_size: int = DEFAULT_BATCH_SIZE,
+                                  dry_run: bool = False, show: int = 20) -> int:
+    """
+    Keep the oldest row of every duplicate group and delete the rest.
+
+    One window-function pass collects the ids to delete; they are then
+    removed by primary key in batches of `batch_size`, committing after
+    each batch so locks are held only briefly. Each batch rebuilds the
+    rollups of the files it deleted from in the same transaction, so a
+    failure partway through never leaves rollups counting deleted rows.
+    Returns the number of rows deleted; errors are re-raised.
+    """
+    columns = key_columns(key)
     db: Session = SessionLocal()
 
     try:
-        print("🔍 Scanning for duplicates...")
-
-        # Group by details + amount + timestamp, count how many
-        duplicates = (
-            db.query(
-                Transaction.details,
-                Transaction.amount,
-                Transaction.timestamp,
-                func.count(Transaction.id).label("count")
-            )
-            .group_by(Transaction.details, Transaction.amount, Transaction.timestamp)
-            .having(func.count(Transaction.id) > 1)
-            .all()
+        print(f"🔍 Scanning for duplicates on ({', '.join(c.name for c in columns)})...")
+        if dry_run:
+            report_duplicates(db, columns, show)
+            return 0
+
+        ranked = ranked_transactions(columns)
+        ids = array("q")
+        rows = db.execute(
+            select(ranked.c.id).where(ranked.c.rn > 1).order_by(ranked.c.id),
+            execution_options={"yield_per": 50000},
         )
+        for (txn_id,) in rows:
+            ids.append(txn_id)
+        db.commit()  # end the read before deleting, so the scan holds no locks
+
+        total = len(ids)
+        if not total:
+            print("✅ Done. No duplicate transactions found.")
+            return 0
+
+        deleted = 0
+        touched_files = set()
+        for start in range(0, total, batch_size):
+            batch = ids[start:start + batch_size].tolist()
+            files = set(db.scalars(
+                select(Transaction.file_id).where(Transaction.id.in_(batch)).distinct()
+            ))
+            deleted += db.execute(
+                delete(Transaction)
+                .where(Transaction.id.in_(batch))
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            files.discard(None)
+            refresh_rollups(db, files)
+            db.commit()
+            touched_files |= files
+            print(f"🧹 Deleted {deleted}/{total} ({deleted * 100 // total}%)")
+
+        print(f"✅ Done. {deleted} duplicate transactions deleted from {len(touched_files)} files.")
+        return deleted
 
-        total_deleted = 0
-
-        for dup in duplicates:
-            # Fetch all duplicates for the group
-            txns = (
-                db.query(Transaction)
-                .filter(
-                    Transaction.details == dup.details,
-                    Transaction.amount == dup.amount,
-                    Transaction.timestamp == dup.timestamp
-                )
-                .order_by(Transaction.id)
-                .all()
-            )
-
-            # Keep the first, delete the rest
-            for txn in txns[1:]:
-                db.delete(txn)
-                total_deleted += 1
-
-        db.commit()
-        print(f"✅ Done. {total_deleted} duplicate transactions deleted.")
-    
     except Exception as e:
         print("❌ Error during deduplication:", e)
         db.rollback()
+        raise
     finally:
         db.close()
 
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Delete duplicate transactions, keeping the oldest of each group.")
+    parser.add_argument("--key", default=",".join(NATURAL_KEY),
+                        help="comma-separated columns that identify a duplicate (default: the ingest natural key)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="rows deleted per transaction")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="only report duplicate counts per key, delete nothing")
+    parser.add_argument("--show", type=int, default=20,
+                        help="duplicate keys listed by --dry-run (0 = all)")
+    args = parser.parse_args(argv)
+    try:
+        key_columns(args.key)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+
+    try:
+        delete_duplicate_transactions(args.key, args.batch_size, args.dry_run, args.show)
+    except Exception:
+        sys.exit(1)
+
+
 if __name__ == "__main__":
-    delete_duplicate_transactions()
+    main()
@@ -0,0 +1,23 @@
+import sys
+
+from backend.db.db import SessionLocal
+from backend.db.rollups import rebuild_rollups
+
+
+def main():
+    db = SessionLocal()
+    try:
+        print("🔄 Rebuilding transaction rollups...")
+        rebuild_rollups(db)
+        db.commit()
+        print("✅ Done. Rollups rebuilt from the transactions table.")
+    except Exception as e:
+        print("❌ Error while rebuilding rollups:", e)
+        db.rollback()
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
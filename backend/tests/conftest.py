@@ -0,0 +1,66 @@
+# backend/tests/conftest.py
+
+import os
+
+# Must be set before backend.db.db is imported; tests never touch Postgres
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateTable
+
+from backend.db.db import get_async_db, get_db
+from backend.db.models import Transaction
+from backend.main import app
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """A fresh SQLite database file holding the transactions table."""
+    path = tmp_path / "test.db"
+    engine = create_engine(f"sqlite:///{path}")
+    # The table alone: backend/models/transaction.py declares the same
+    # indexes again, so create_all() would try to create each one twice
+    with engine.begin() as conn:
+        conn.execute(CreateTable(Transaction.__table__))
+    engine.dispose()
+    return path
+
+
+@pytest.fixture
+def db(db_path):
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+@pytest.fixture
+def client(db_path):
+    """A TestClient whose sync and async sessions both use the test database."""
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    make_session = sessionmaker(bind=engine)
+    make_async_session = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+    def override_db():
+        with make_session() as session:
+            yield session
+
+    async def override_async_db():
+        async with make_async_session() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_db
+    app.dependency_overrides[get_async_db] = override_async_db
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+        engine.dispose()
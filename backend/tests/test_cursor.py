@@ -0,0 +1,52 @@
+# backend/tests/test_cursor.py
+
+from datetime import datetime
+
+import pytest
+
+from backend.db.models import Transaction
+from backend.db.queries import decode_cursor, encode_cursor
+
+
+@pytest.mark.parametrize("when, txn_id", [
+    (datetime(2024, 3, 1), 1),
+    (datetime(2024, 3, 1, 23, 59, 59, 123456), 987654321),
+])
+def test_round_trip(when, txn_id):
+    cursor = encode_cursor(when, txn_id)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (when, txn_id)
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", "Zm9v", encode_cursor(datetime(2024, 1, 1), 1)[:-3]])
+def test_decode_rejects_garbage(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_listing_pages_through_every_row(db, client):
+    # Five rows share one date so paging has to fall back to the id tiebreak
+    for i in range(12):
+        db.add(Transaction(file_id="f1", details=f"ROW {i}", amount=-1.0, category="Other",
+                           transaction_date=datetime(2024, 1, 1 + min(i, 7))))
+    db.commit()
+
+    seen, cursor = [], None
+    while True:
+        params = {"file_id": "f1", "limit": 5, "fields": "id,details"}
+        if cursor:
+            params["cursor"] = cursor
+        body = client.get("/transactions", params=params).json()
+        seen.extend(row["details"] for row in body["transactions"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == 12
+    assert seen == [f"ROW {i}" for i in (11, 10, 9, 8, 7, 6, 5, 4, 3, 2, 1, 0)]
+
+
+def test_listing_rejects_bad_cursor(client):
+    response = client.get("/transactions", params={"file_id": "f1", "cursor": "not a cursor"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor."
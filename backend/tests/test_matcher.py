@@ -0,0 +1,91 @@
+# backend/tests/test_matcher.py
+
+import pytest
+
+from backend.utils.matcher import KeywordMatcher, get_matcher
+
+# Overlapping ("uber" / "uber eats" / "eats"), nested ("pay" inside "paypal"
+# inside "paypal netflix") and repeated keywords, in an order where the
+# longer keyword sometimes comes first and sometimes last
+CATEGORY_MAP = {
+    "uber eats": "Food",
+    "uber": "Transport",
+    "eats": "Food",
+    "pay": "Transfers",
+    "paypal netflix": "Entertainment",
+    "paypal": "Shopping",
+    "Netflix": "Entertainment",
+    "flix": "Other",
+    "aa": "Doubled",
+    "aaa": "Tripled",
+    "she": "Pronoun",
+    "hers": "Possessive",
+}
+
+TEXTS = [
+    "UBER EATS ORDER 123",
+    "uber trip",
+    "EATS ON UBER",
+    "PAYPAL *NETFLIX.COM",
+    "paypal netflix",
+    "NETFLIX.COM",
+    "netflixpay",
+    "AAAA",
+    "ushers",
+    "no keyword here",
+    "",
+]
+
+
+def first_match(text, category_map):
+    """The per-row loop KeywordMatcher replaced: first keyword in map order wins."""
+    lowered = text.lower()
+    for keyword, category in category_map.items():
+        if keyword.lower() in lowered:
+            return category
+    return None
+
+
+def last_match(text, category_map):
+    """apply_memory's old successive overwrites: last keyword in map order wins."""
+    found = None
+    for keyword, category in category_map.items():
+        if keyword.lower() in text.lower():
+            found = category
+    return found
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_prefer_first_matches_loop(text):
+    assert KeywordMatcher(CATEGORY_MAP).match(text) == first_match(text, CATEGORY_MAP)
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_prefer_last_matches_loop(text):
+    assert KeywordMatcher(CATEGORY_MAP, prefer="last").match(text) == last_match(text, CATEGORY_MAP)
+
+
+def test_reversed_map_order():
+    reversed_map = dict(reversed(list(CATEGORY_MAP.items())))
+    matcher = KeywordMatcher(reversed_map)
+    for text in TEXTS:
+        assert matcher.match(text) == first_match(text, reversed_map)
+
+
+def test_match_many():
+    texts = TEXTS + TEXTS[:3]
+    assert get_matcher(CATEGORY_MAP).match_many(texts) == {
+        text: first_match(text, CATEGORY_MAP) for text in texts
+    }
+
+
+def test_get_matcher_rebuilds_when_map_changes():
+    category_map = {"uber": "Transport"}
+    assert get_matcher(category_map).match("uber eats") == "Transport"
+    category_map = {"uber eats": "Food", **category_map}
+    assert get_matcher(category_map).match("uber eats") == "Food"
+
+
+def test_invalid_prefer():
+    with pytest.raises(ValueError):
+        KeywordMatcher(CATEGORY_MAP, prefer="longest")
@@ -0,0 +1,39 @@
+# backend/tests/test_model_utils.py
+
+from backend.ml.model_utils import predict_categories
+
+
+class EchoVectorizer:
+    def transform(self, texts):
+        return list(texts)
+
+
+class PickyModel:
+    """Fails any batch containing a "bad" text, as a real model might on odd input."""
+
+    def predict(self, rows):
+        if any("bad" in row for row in rows):
+            raise ValueError(f"cannot predict {rows[0]!r}")
+        return [row.upper() for row in rows]
+
+
+def test_failed_batch_logs_one_summary_line(capsys):
+    texts = ["ok 1", "bad 1", "ok 2", "bad 2", "bad 3", "ok 3"]
+    predictions = predict_categories(PickyModel(), EchoVectorizer(), texts, chunk_size=3)
+
+    assert predictions == ["OK 1", "Uncategorized", "OK 2", "Uncategorized", "Uncategorized", "OK 3"]
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 2  # one per failed batch, not one per failed row
+    assert "1 still failed (first: cannot predict 'bad 1')" in lines[0]
+    assert "2 still failed (first: cannot predict 'bad 2')" in lines[1]
+
+
+def test_batch_that_recovers_per_row(capsys):
+    class FlakyModel(PickyModel):
+        def predict(self, rows):
+            if len(rows) > 1:
+                raise RuntimeError("batch too big")
+            return super().predict(rows)
+
+    assert predict_categories(FlakyModel(), EchoVectorizer(), ["a", "b"]) == ["A", "B"]
+    assert capsys.readouterr().out.count("\n") == 1
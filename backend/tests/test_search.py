@@ -0,0 +1,69 @@
+# backend/tests/test_search.py
+
+from datetime import datetime
+
+import pytest
+
+from backend.db import search
+from backend.db.models import Transaction
+
+
+@pytest.fixture(autouse=True)
+def fresh_index(monkeypatch):
+    monkeypatch.setattr(search, "_fallback_index", search.DetailsIndex())
+
+
+def add(db, *details):
+    for i, text in enumerate(details):
+        db.add(Transaction(file_id="f1", details=text, amount=-10.0 - i, category="Other",
+                           transaction_date=datetime(2024, 1, 1 + i)))
+    db.commit()
+
+
+def test_substring_match_ranks_first(db):
+    add(db, "NETFLIX.COM", "UBER TRIP", "UBER EATS")
+    rows = search.search_transactions(db, "uber", [], limit=10)
+    assert [row["details"] for row in rows] == ["UBER EATS", "UBER TRIP"]
+    assert all(row["rank"] == 1.0 for row in rows)
+
+
+def test_fuzzy_match_tolerates_misspelling(db):
+    add(db, "NETFLIX.COM", "SPOTIFY PREMIUM")
+    rows = search.search_transactions(db, "netflx", [], limit=10)
+    assert [row["details"] for row in rows] == ["NETFLIX.COM"]
+    assert 0 < rows[0]["rank"] < 1
+
+
+def test_new_rows_are_indexed_on_next_search(db):
+    add(db, "NETFLIX.COM")
+    assert search.search_transactions(db, "spotify", [], limit=10) == []
+    add(db, "SPOTIFY PREMIUM")
+    assert len(search.search_transactions(db, "spotify", [], limit=10)) == 1
+
+
+def test_filters_and_pagination(db):
+    add(db, *["UBER TRIP"] * 5)
+    filters = [Transaction.amount < -10.5]
+    rows = search.search_transactions(db, "uber", filters, limit=2, offset=0)
+    assert len(rows) == 3  # limit + 1 signals another page
+    rest = search.search_transactions(db, "uber", filters, limit=2, offset=2)
+    assert len(rest) == 2
+    assert {row["id"] for row in rows[:2]}.isdisjoint(row["id"] for row in rest)
+
+
+def test_index_stops_growing_at_max_details(db):
+    index = search.DetailsIndex(max_details=2)
+    add(db, "ALPHA", "BRAVO", "CHARLIE")
+    index.refresh(db)
+    assert index.full
+    assert set(index.match("charlie")) == set()
+    assert set(index.match("alpha")) == {"ALPHA"}
+
+
+def test_search_endpoint(db, client):
+    add(db, "UBER TRIP", "UBER EATS", "NETFLIX.COM")
+    response = client.get("/transactions/search", params={"q": "uber", "limit": 1})
+    assert response.status_code == 200
+    body = response.json()
+    assert [row["details"] for row in body["results"]] == ["UBER EATS"]
+    assert body["next_offset"] == 1
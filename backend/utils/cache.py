@@ -0,0 +1,80 @@
+# backend/utils/cache.py
+
+import threading
+import time
+from collections import OrderedDict
+
+from backend.config import RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL
+
+MISSING = object()
+
+
+class ResponseCache:
+    """
+    Size-bounded LRU cache with a per-entry TTL. Keys are tuples whose
+    second element is the file_id, so every entry of a file can be dropped
+    at once when its data changes.
+    The cache is per process; each uvicorn worker keeps its own.
+    """
+
+    def __init__(self, maxsize: int = RESPONSE_CACHE_SIZE, ttl: float = RESPONSE_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        """Return the cached value for key, or MISSING."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, file_id=None):
+        """Drop every entry for file_id, or everything when file_id is None."""
+        with self._lock:
+            if file_id is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+            else:
+                stale = [key for key in self._entries if key[1] == file_id]
+                for key in stale:
+                    del self._entries[key]
+                dropped = len(stale)
+            self.invalidations += dropped
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+response_cache = ResponseCache()
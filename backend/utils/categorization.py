@@ -0,0 +1,75 @@
+# backend/utils/categorization.py
+
+import re
+import pandas as pd
+
+from backend.ml.model_utils import predict_categories
+from backend.utils.matcher import get_matcher
+from backend.utils.metrics import StageTimer
+
+# Details containing any of these are flagged for the user to confirm
+AMBIGUOUS_KEYWORDS = ["withdraw", "agent", "transfer", "peer"]
+_AMBIGUOUS_PATTERN = "|".join(re.escape(kw) for kw in AMBIGUOUS_KEYWORDS)
+
+
+def _is_blank(categories: pd.Series) -> pd.Series:
+    return categories.isna() | (categories == "")
+
+
+def needs_confirmation(details: pd.Series) -> pd.Series:
+    """True for details containing any of the AMBIGUOUS_KEYWORDS (case-insensitive)."""
+    return details.astype(str).str.lower().str.contains(_AMBIGUOUS_PATTERN, regex=True)
+
+
+def _match_keywords(lowered: pd.Series, category_map: dict) -> pd.Series:
+    """
+    First-match keyword lookup, one automaton pass per unique detail.
+    A keyword earlier in category_map wins over later ones.
+    """
+    return lowered.map(get_matcher(category_map).match_many(lowered))
+
+
+def _predict(model, vectorizer, details: pd.Series) -> pd.Series:
+    """Predict each unique detail once, in batches."""
+    unique = details.unique()
+    predictions = predict_categories(model, vectorizer, unique)
+    return details.map(dict(zip(unique, predictions)))
+
+
+def categorize(details: pd.Series, categories, memory_map: dict, category_map: dict,
+               model, vectorizer) -> pd.DataFrame:
+    """
+    Resolve a category for every transaction detail, in order of precedence:
+    existing category, exact memory match, keyword rule, then the ML model.
+    Returns a DataFrame with 'Category' and 'Needs_Confirmation' columns
+    aligned to the index of `details`.
+    """
+    details = details.astype(str)
+    lowered = details.str.lower()
+
+    if categories is None:
+        categories = pd.Series(None, index=details.index, dtype=object)
+    categories = categories.astype(object)
+
+    # 1. Learned memory: exact match on the lowered detail
+    missing = categories.isna()
+    if missing.any():
+        with StageTimer("memory", int(missing.sum())):
+            categories[missing] = lowered[missing].map(memory_map)
+
+    # 2. Keyword rules for anything still blank
+    blank = _is_blank(categories)
+    if blank.any():
+        with StageTimer("rules", int(blank.sum())):
+            categories[blank] = _match_keywords(lowered[blank], category_map)
+
+    # 3. ML model for the remainder
+    residual = _is_blank(categories) | (categories == "Uncategorized")
+    if residual.any():
+        with StageTimer("ml", int(residual.sum())):
+            categories[residual] = _predict(model, vectorizer, details[residual])
+
+    return pd.DataFrame({
+        "Category": categories,
+        "Needs_Confirmation": needs_confirmation(lowered),
+    }, index=details.index)
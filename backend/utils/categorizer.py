@@ -1,7 +1,9 @@
-import joblib
 import os
 import pandas as pd
 
+from backend.ml.model_utils import predict_categories
+from backend.utils.matcher import get_matcher
+
 # Predefined manual tagging map
 MEMORY_MAP = {
     "airtel": "Airtime",
@@ -36,9 +38,9 @@ def get_model():
     """
     Load the trained ML model and vectorizer from disk.
     """
+    import joblib
+
     try:
-        print(f"[DEBUG] Loading model from: {MODEL_PATH}")
-        print(f"[DEBUG] Loading vectorizer from: {VEC_PATH}")
         model = joblib.load(MODEL_PATH)
         vec = joblib.load(VEC_PATH)
         return model, vec
@@ -49,20 +51,17 @@ def predict_category(model, vec, text: str) -> str:
     """
     Predict the category of a transaction using the trained model.
     """
-    try:
-        X = vec.transform([text])
-        return model.predict(X)[0]
-    except Exception as e:
-        print("⚠️ Prediction failed:", e)
-        return "Uncategorized"
+    return predict_categories(model, vec, [text])[0]
 
 def apply_memory(df: pd.DataFrame, memory_map: dict = MEMORY_MAP) -> pd.DataFrame:
     """
     Apply hardcoded keyword mapping to transactions before ML.
+    When several keywords match, the one listed last in memory_map wins.
     """
-    for keyword, category in memory_map.items():
-        df.loc[
-            df["Details"].str.contains(keyword, case=False, na=False, regex=False),  # ✅ updated here
-            "Category"
-        ] = category
+    details = df["Details"]
+    present = details.notna()
+    matches = get_matcher(memory_map, prefer="last").match_many(details[present])
+    categories = details[present].map(matches)
+    hits = categories.notna()
+    df.loc[hits[hits].index, "Category"] = categories[hits]
     return df
@@ -1,9 +1,26 @@
 # utils/export_pdf.py
 
-from fpdf import FPDF
-import pandas as pd
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from backend.config import PDF_WORKERS, REPORT_MAX_AGE_SECONDS
+
+# Bump when the report layout changes so cached PDFs are regenerated
+REPORT_LAYOUT_VERSION = 1
+
+_executor = ThreadPoolExecutor(max_workers=PDF_WORKERS, thread_name_prefix="pdf")
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
 
 def generate_pdf_report(df_summary, total_income, total_spent, output_path):
+    from fpdf import FPDF
+
     pdf = FPDF()
     pdf.add_page()
     pdf.set_font("Arial", 'B', 16)
@@ -31,3 +48,82 @@ def generate_pdf_report(df_summary, total_income, total_spent, output_path):
         pdf.ln()
 
     pdf.output(output_path)
+
+
+def report_digest(df_summary, total_income, total_spent) -> str:
+    """Content hash of everything that ends up in the report."""
+    payload = json.dumps(
+        {
+            "version": REPORT_LAYOUT_VERSION,
+            "summary": df_summary,
+            "total_income": round(float(total_income), 2),
+            "total_spent": round(float(total_spent), 2),
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _build_report(df_summary, total_income, total_spent, path):
+    # Write to a temp file first so readers never see a half-written PDF.
+    # mkstemp names are unique across processes, so two API workers building
+    # the same digest each replace the report with a complete file.
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".pdf.tmp")
+    os.close(fd)
+    try:
+        generate_pdf_report(df_summary, total_income, total_spent, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+
+def ensure_report(df_summary, total_income, total_spent, reports_dir):
+    """
+    Return a Future resolving to the path of the report for these inputs.
+    An existing report with the same content digest is reused as is;
+    otherwise it is generated on the PDF thread pool, and concurrent
+    requests for the same digest share a single generation.
+    """
+    digest = report_digest(df_summary, total_income, total_spent)
+    path = os.path.join(reports_dir, f"{digest}.pdf")
+    if os.path.exists(path):
+        os.utime(path)  # keeps frequently served reports out of garbage collection
+        done = Future()
+        done.set_result(path)
+        return done
+
+    with _in_flight_lock:
+        future = _in_flight.get(digest)
+        if future is None:
+            os.makedirs(reports_dir, exist_ok=True)
+            future = _executor.submit(_build_report, df_summary, total_income, total_spent, path)
+            _in_flight[digest] = future
+            future.add_done_callback(lambda _: _forget(digest))
+            _executor.submit(gc_reports, reports_dir)
+    return future
+
+
+def _forget(digest):
+    with _in_flight_lock:
+        _in_flight.pop(digest, None)
+
+
+def gc_reports(reports_dir, max_age=REPORT_MAX_AGE_SECONDS) -> int:
+    """Delete reports not served or generated within max_age seconds."""
+    if not os.path.isdir(reports_dir):
+        return 0
+    cutoff = time.time() - max_age
+    removed = 0
+    for name in os.listdir(reports_dir):
+        path = os.path.join(reports_dir, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
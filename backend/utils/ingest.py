@@ -0,0 +1,146 @@
+# backend/utils/ingest.py
+
+import hashlib
+
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from backend.config import CSV_CHUNK_ROWS, UPLOAD_CHUNK_BYTES, DATE_FORMAT, DATE_FALLBACK_FORMATS
+from backend.db.bulk import insert_transactions
+from backend.db.rollups import refresh_rollups
+from backend.utils.categorization import categorize
+from backend.utils.metrics import StageTimer
+from backend.utils.storage import ArtifactWriter
+
+REQUIRED_COLUMNS = ("Details", "Amount (MWK)")
+
+
+async def spool_upload(file, path: str, chunk_size: int = UPLOAD_CHUNK_BYTES) -> tuple:
+    """
+    Copy an uploaded file to disk chunk by chunk so the whole body is never
+    held in memory, hashing it on the way.
+    Returns (bytes written, MD5 hex digest of the content).
+    """
+    size = 0
+    digest = hashlib.md5(usedforsecurity=False)
+    with open(path, "wb") as f:
+        while chunk := await file.read(chunk_size):
+            f.write(chunk)
+            digest.update(chunk)
+            size += len(chunk)
+    return size, digest.hexdigest()
+
+
+def parse_dates(df: pd.DataFrame, formats=None) -> pd.Series:
+    """
+    Parse the Date and Time columns into one datetime column. The primary
+    format is applied to the whole column at once; each fallback format is
+    then tried only on the rows that are still unparsed. Unparseable rows
+    become NaT.
+    """
+    if formats is None:
+        formats = [DATE_FORMAT, *DATE_FALLBACK_FORMATS]
+    if "Date" not in df.columns or "Time" not in df.columns:
+        return pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns]")
+
+    combined = df["Date"].astype(str) + " " + df["Time"].astype(str)
+    parsed = pd.to_datetime(combined, format=formats[0], errors="coerce")
+    for fmt in formats[1:]:
+        missing = parsed.isna()
+        if not missing.any():
+            break
+        parsed[missing] = pd.to_datetime(combined[missing], format=fmt, errors="coerce")
+    return parsed
+
+
+def clean_chunk(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalise details and amounts, parse the Date/Time columns and drop rows
+    missing any of the values a transaction needs.
+    """
+    missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError("CSV must have 'Details' and 'Amount (MWK)' columns.")
+
+    df["Details"] = df["Details"].astype(str).str.strip()
+    df["Amount (MWK)"] = (
+        df["Amount (MWK)"].astype(str)
+        .str.replace(",", "")
+        .str.replace("K", "000")
+    )
+    df["Amount (MWK)"] = pd.to_numeric(df["Amount (MWK)"], errors='coerce')
+
+    df["transaction_date"] = parse_dates(df)
+    df["Timestamp"] = df["transaction_date"]
+    return df.dropna(subset=["transaction_date", "Details", "Amount (MWK)"])
+
+
+def to_records(df: pd.DataFrame, file_id: str, file_hash: str = None) -> list:
+    """Map a categorized chunk onto Transaction column names."""
+    return pd.DataFrame({
+        "file_id": file_id,
+        "file_hash": file_hash,
+        "details": df["Details"],
+        "amount": df["Amount (MWK)"].astype(float),
+        "category": df["Category"],
+        "timestamp": df["Timestamp"],
+        "transaction_date": df["transaction_date"],
+        "needs_confirmation": df["Needs_Confirmation"].astype(bool),
+    }).astype(object).where(lambda d: d.notna(), None).to_dict(orient="records")
+
+
+def ingest_csv(db: Session, csv_path: str, categorized_path: str, file_id: str,
+               memory_map: dict, category_map: dict, model, vectorizer,
+               chunksize: int = CSV_CHUNK_ROWS, progress=None, file_hash: str = None) -> dict:
+    """
+    Run parse → categorize → insert over a CSV one chunk at a time, appending
+    each categorized chunk to the artifact at categorized_path (Parquet or
+    CSV, by its extension). Peak memory is bounded by the
+    chunk size rather than the file size. The file's rollup rows are
+    refreshed in the same transaction. The caller owns the commit.
+    If given, progress(stats) is called after every chunk. Each stage is
+    timed into the ingest metrics (see utils/metrics.py).
+    Returns row counts for the whole file.
+    """
+    stats = {"rows": 0, "stored": 0, "added": 0}
+
+    with ArtifactWriter(categorized_path) as artifact:
+        reader = pd.read_csv(csv_path, chunksize=chunksize)
+        while True:
+            with StageTimer("read_csv") as timer:
+                chunk = next(reader, None)
+                timer.rows = 0 if chunk is None else len(chunk)
+            if chunk is None:
+                break
+            stats["rows"] += len(chunk)
+
+            with StageTimer("clean") as timer:
+                chunk = clean_chunk(chunk)
+                timer.rows = len(chunk)
+            if chunk.empty:
+                if progress:
+                    progress(stats)
+                continue
+
+            categorized = categorize(
+                chunk["Details"], chunk.get("Category"), memory_map, category_map, model, vectorizer
+            )
+            chunk["Category"] = categorized["Category"]
+            chunk["Needs_Confirmation"] = categorized["Needs_Confirmation"]
+
+            with StageTimer("artifact_write", len(chunk)):
+                artifact.write(chunk)
+
+            stats["stored"] += len(chunk)
+            with StageTimer("db_insert", len(chunk)):
+                stats["added"] += insert_transactions(db, to_records(chunk, file_id, file_hash))
+            if progress:
+                progress(stats)
+
+    if stats["added"]:
+        with StageTimer("rollups"):
+            refresh_rollups(db, [file_id])
+
+    stats["dropped"] = stats["rows"] - stats["stored"]
+    stats["skipped"] = stats["stored"] - stats["added"]
+    return stats
@@ -0,0 +1,177 @@
+# backend/utils/jobs.py
+
+import multiprocessing
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+from backend.config import INGEST_JOB_STALE_SECONDS, INGEST_WORKERS
+from backend.db.db import SessionLocal
+from backend.db.bulk import record_uploaded_file
+from backend.db.models import IngestJob
+from backend.utils import metrics
+from backend.utils.memory import load_memory
+from backend.utils.resources import resources
+
+_executor = None
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+def _init_worker():
+    """Runs once in each pool process: load rules and the model."""
+    resources.current()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # Spawned, not forked: forking the multithreaded API process can copy a
+        # lock another thread holds (memory store, metrics) into the child
+        _executor = ProcessPoolExecutor(
+            max_workers=INGEST_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+    return _executor
+
+
+def _update_job(job_id: str, **fields):
+    """Write job status in its own short transaction so pollers see it immediately."""
+    db = SessionLocal()
+    try:
+        db.query(IngestJob).filter(IngestJob.id == job_id).update(fields)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _fail_job(job_id: str, error: str):
+    """Mark a job failed unless it already finished. Never raises."""
+    db = SessionLocal()
+    try:
+        db.query(IngestJob).filter(
+            IngestJob.id == job_id, IngestJob.status.in_(ACTIVE_STATUSES)
+        ).update({"status": "failed", "error": error}, synchronize_session=False)
+        db.commit()
+    except Exception as e:
+        print(f"⚠️ Could not mark job {job_id} failed: {e}")
+    finally:
+        db.close()
+
+
+def is_stale(job: IngestJob, max_age: int = INGEST_JOB_STALE_SECONDS) -> bool:
+    """True if an unfinished job has not reported progress within max_age seconds."""
+    return job.status in ACTIVE_STATUSES and job.updated_at < datetime.utcnow() - timedelta(seconds=max_age)
+
+
+def fail_stale_jobs(max_age: int = INGEST_JOB_STALE_SECONDS) -> int:
+    """
+    Mark queued/running jobs that stopped reporting as failed, e.g. after a
+    restart killed their worker. Jobs of other live API processes keep
+    updating their rows, so they are not touched. Returns the rows marked.
+    """
+    db = SessionLocal()
+    try:
+        count = db.query(IngestJob).filter(
+            IngestJob.status.in_(ACTIVE_STATUSES),
+            IngestJob.updated_at < datetime.utcnow() - timedelta(seconds=max_age),
+        ).update(
+            {"status": "failed", "error": "Interrupted: the server stopped before the job finished."},
+            synchronize_session=False,
+        )
+        db.commit()
+        return count
+    finally:
+        db.close()
+
+
+def _run_ingest_job(job_id: str, file_id: str, csv_path: str, categorized_path: str,
+                    file_hash: str = None, size_bytes: int = 0):
+    """
+    Pool entry point: run the ingest pipeline and record its progress.
+    Returns the metrics this job recorded in the worker, for the parent to merge.
+    """
+    from backend.utils.ingest import ingest_csv
+
+    _update_job(job_id, status="running")
+
+    def progress(stats):
+        # Best effort: a failed progress write must not fail the ingest itself
+        try:
+            _update_job(
+                job_id,
+                rows_processed=stats["rows"],
+                rows_stored=stats["stored"],
+                rows_added=stats["added"],
+            )
+        except Exception as e:
+            print(f"⚠️ Could not record progress for job {job_id}: {e}")
+
+    # Workers have no watcher thread; pick up new rules or a new model per job
+    resources.check()
+    res = resources.current()
+    db = SessionLocal()
+    try:
+        stats = ingest_csv(
+            db, csv_path, categorized_path, file_id,
+            load_memory(), res.category_map, res.model, res.vectorizer,
+            progress=progress,
+            file_hash=file_hash,
+        )
+        if file_hash:
+            record_uploaded_file(db, file_hash, file_id, size_bytes, stats)
+        with metrics.StageTimer("commit"):
+            db.commit()
+    except Exception as e:
+        db.rollback()
+        traceback.print_exc()
+        _update_job(job_id, status="failed", error=str(e))
+        return metrics.drain()
+    finally:
+        db.close()
+
+    _update_job(
+        job_id,
+        status="completed",
+        rows_processed=stats["rows"],
+        rows_stored=stats["stored"],
+        rows_added=stats["added"],
+        rows_skipped=stats["skipped"],
+    )
+    return metrics.drain()
+
+
+def _job_done(job_id: str, future):
+    """
+    Done callback in the API process. Records the jobs that could not record
+    their own outcome, and folds a finished job's worker metrics into /metrics.
+    """
+    if future.cancelled():
+        _fail_job(job_id, "The server shut down before the job started.")
+        return
+    error = future.exception()
+    if error is not None:
+        # The worker died (BrokenProcessPool) before it could record the failure
+        _fail_job(job_id, f"The ingest worker stopped unexpectedly: {error}")
+        return
+    metrics.merge(future.result())
+
+
+def submit_ingest_job(job_id: str, file_id: str, csv_path: str, categorized_path: str,
+                      file_hash: str = None, size_bytes: int = 0):
+    """Queue an already-recorded IngestJob on the local worker pool."""
+    future = _get_executor().submit(
+        _run_ingest_job, job_id, file_id, csv_path, categorized_path, file_hash, size_bytes
+    )
+    future.add_done_callback(lambda done: _job_done(job_id, done))
+
+
+def shutdown_jobs():
+    """Stop the pool. Queued jobs are cancelled and marked failed."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+ACTIVE_STATUSES = ("queued", "running")
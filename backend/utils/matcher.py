@@ -0,0 +1,103 @@
+# backend/utils/matcher.py
+
+from collections import deque
+from functools import lru_cache
+
+_NO_MATCH = float("inf")
+
+
+class KeywordMatcher:
+    """
+    Aho–Corasick automaton over a {keyword: category} map.
+
+    Every keyword is found in a single pass over the text, case-insensitively.
+    When several keywords occur in the same text, the one with the best
+    priority wins: with prefer="first" that is the keyword listed first in the
+    map (the semantics of auto_categorize), with prefer="last" the keyword
+    listed last (the semantics of apply_memory's successive overwrites).
+    """
+
+    def __init__(self, category_map: dict, prefer: str = "first"):
+        if prefer not in ("first", "last"):
+            raise ValueError("prefer must be 'first' or 'last'")
+        items = list(category_map.items())
+        if prefer == "last":
+            items.reverse()
+        self.categories = [category for _, category in items]
+        self._build([str(keyword).lower() for keyword, _ in items])
+
+    def _build(self, keywords):
+        goto, fail, best = [{}], [0], [_NO_MATCH]
+
+        # Trie of all keywords; each terminal node keeps its best (lowest) rank
+        for rank, keyword in enumerate(keywords):
+            node = 0
+            for ch in keyword:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    fail.append(0)
+                    best.append(_NO_MATCH)
+                node = nxt
+            best[node] = min(best[node], rank)
+
+        # Failure links, breadth first, folding in the best rank reachable via them
+        queue = deque()
+        for child in goto[0].values():
+            best[child] = min(best[child], best[0])
+            queue.append(child)
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[child] = goto[f].get(ch, 0)
+                best[child] = min(best[child], best[fail[child]])
+                queue.append(child)
+
+        self._goto, self._fail, self._best = goto, fail, best
+
+    def find(self, text) -> int:
+        """Return the rank of the winning keyword in text, or -1 if none match."""
+        goto, fail, best = self._goto, self._fail, self._best
+        found = best[0]
+        node = 0
+        for ch in str(text).lower():
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if best[node] < found:
+                found = best[node]
+                if found == 0:
+                    break
+        return -1 if found == _NO_MATCH else found
+
+    def match(self, text):
+        """Return the category of the winning keyword in text, or None."""
+        rank = self.find(text)
+        return None if rank < 0 else self.categories[rank]
+
+    def match_many(self, texts) -> dict:
+        """Match each distinct text once and return {text: category or None}."""
+        return {text: self.match(text) for text in set(texts)}
+
+
+@lru_cache(maxsize=8)
+def _compile(items: tuple, prefer: str) -> KeywordMatcher:
+    return KeywordMatcher(dict(items), prefer=prefer)
+
+
+def get_matcher(category_map: dict, prefer: str = "first") -> KeywordMatcher:
+    """
+    Return a compiled matcher for category_map. The automaton is built once
+    per distinct map content and rebuilt automatically when the map changes.
+    """
+    return _compile(tuple(category_map.items()), prefer)
+
+
+def matcher_cache_info():
+    """Hits and misses of the compiled-matcher cache (functools cache_info)."""
+    return _compile.cache_info()
@@ -1,51 +1,197 @@
-import json
-import os
-import pandas as pd
+# backend/utils/memory.py
 
-ASSETS_DIR = os.path.join(os.path.dirname(__file__), '..', 'assets')
-MEMORY_MAP_PATH = os.path.join(ASSETS_DIR, 'memory_map.json')
+import math
+import threading
+import time
+from datetime import datetime
 
-def load_memory():
-    """Load memory map of previous user-labeled descriptions."""
-    if os.path.exists(MEMORY_MAP_PATH):
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from backend.config import INSERT_BATCH_SIZE, MEMORY_CACHE_TTL
+from backend.db.bulk import _DIALECT_INSERTS
+from backend.db.db import SessionLocal
+from backend.db.models import CategoryMemory
+
+
+class MemoryStore:
+    """
+    Read-through cache over the category_memory table.
+
+    Each process keeps the whole map in memory and, at most every `ttl`
+    seconds, compares the table's (row count, newest updated_at) against
+    the copy it holds, reloading only when another worker has written.
+    Writes go straight to the database as row-level upserts, so concurrent
+    /categorize calls from different workers never overwrite each other.
+    """
+
+    def __init__(self, ttl: float = MEMORY_CACHE_TTL):
+        self.ttl = ttl
+        self._map = {}
+        self._version = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._generation = 0
+        self.reloads = 0
+
+    @staticmethod
+    def _current_version(db: Session):
+        return tuple(db.execute(
+            select(func.count(), func.max(CategoryMemory.updated_at))
+        ).one())
+
+    def get(self) -> dict:
+        """Return the {detail: category} map. Treat it as read-only."""
+        now = time.monotonic()
+        with self._lock:
+            fresh = self._checked_at is not None and now - self._checked_at < self.ttl
+            if fresh or (self._checked_at is not None and self._refreshing):
+                # Another thread is already re-checking: serve the copy we have
+                return self._map
+            self._refreshing = True
+            known, generation = self._version, self._generation
+
+        # The database is read without holding the lock, so a slow query
+        # never blocks other readers
+        loaded = None
+        db = SessionLocal()
         try:
-            with open(MEMORY_MAP_PATH, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            version = self._current_version(db)
+            if version != known:
+                rows = db.execute(select(CategoryMemory.detail, CategoryMemory.category))
+                loaded = (version, dict(rows.all()))
         except Exception as e:
+            # Serve the last good copy rather than failing categorization
             print(f"⚠️ Failed to load memory: {e}")
-    return {}
+        finally:
+            db.close()
+
+        with self._lock:
+            self._refreshing = False
+            if loaded is not None:
+                self._version, self._map = loaded
+                self.reloads += 1
+            if generation == self._generation:
+                # Not invalidated while we were reading
+                self._checked_at = now
+            return self._map
+
+    @property
+    def version(self):
+        """(row count, newest updated_at) of the copy currently held."""
+        return self._version
+
+    def invalidate(self):
+        """Force the next get() to re-check the table."""
+        with self._lock:
+            self._checked_at = None
+            self._generation += 1
+
+    def upsert(self, entries: dict, db: Session = None, overwrite: bool = True) -> int:
+        """
+        Write {detail: category} entries. With overwrite, an existing detail
+        takes the new category (rows already holding it are left untouched);
+        without, known details keep theirs. Returns the number of rows written.
+        When db is given the caller owns the commit and should call
+        invalidate() once it has committed.
+        """
+        rows = _normalize(entries)
+        if not rows:
+            return 0
+        own_session = db is None
+        if own_session:
+            db = SessionLocal()
+        try:
+            insert = _DIALECT_INSERTS[db.get_bind().dialect.name]
+            now = datetime.utcnow()
+            written = 0
+            items = list(rows.items())
+            for start in range(0, len(items), INSERT_BATCH_SIZE):
+                batch = [
+                    {"detail": detail, "category": category, "updated_at": now}
+                    for detail, category in items[start:start + INSERT_BATCH_SIZE]
+                ]
+                stmt = insert(CategoryMemory).values(batch)
+                if overwrite:
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=["detail"],
+                        set_={"category": stmt.excluded.category, "updated_at": stmt.excluded.updated_at},
+                        where=CategoryMemory.category != stmt.excluded.category,
+                    )
+                else:
+                    stmt = stmt.on_conflict_do_nothing(index_elements=["detail"])
+                written += db.execute(stmt).rowcount
+            if own_session:
+                db.commit()
+        except Exception:
+            if own_session:
+                db.rollback()
+            raise
+        finally:
+            if own_session:
+                db.close()
+        if own_session:
+            self.invalidate()
+        return written
 
-def apply_memory(df: pd.DataFrame, memory_map: dict) -> pd.DataFrame:
+
+def _is_missing(value) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def _normalize(entries: dict) -> dict:
+    rows = {}
+    for detail, category in entries.items():
+        if _is_missing(detail) or _is_missing(category):
+            continue
+        detail = str(detail).strip().lower()[:255]
+        category = str(category).strip()[:50]
+        if detail and category:
+            rows[detail] = category
+    return rows
+
+
+memory_store = MemoryStore()
+
+
+def load_memory() -> dict:
+    """Memory map of previous user-labeled descriptions (cached per process)."""
+    return memory_store.get()
+
+
+def apply_memory(df, memory_map: dict):
     """
-    Apply learned memory map to DataFrame, 
+    Apply learned memory map to DataFrame,
     filling in category for known transaction details.
     """
-    def match_memory(detail):
-        return memory_map.get(detail.lower())
-
-    df['Category'] = df.apply(
-        lambda row: match_memory(row['Details']) if pd.isna(row['Category']) else row['Category'],
-        axis=1
-    )
+    known = df['Details'].astype(str).str.lower().map(memory_map)
+    df['Category'] = df['Category'].where(df['Category'].notna(), known)
     return df
 
-def update_memory(df: pd.DataFrame, memory_map: dict):
+
+def update_memory(df, memory_map: dict = None, db: Session = None) -> int:
     """
-    Update the memory map with new user-defined or detected categories,
-    then save it to disk.
+    Remember the category of every detail in df that the memory does not
+    know yet; details already remembered keep their category. Rows without
+    a category are ignored. Returns the number of new entries.
     """
-    updated = False
-    for _, row in df.iterrows():
-        detail = str(row['Details']).strip().lower()
-        category = str(row['Category']).strip()
-        if detail and category and detail not in memory_map:
-            memory_map[detail] = category
-            updated = True
-
-    if updated:
-        try:
-            with open(MEMORY_MAP_PATH, 'w', encoding='utf-8') as f:
-                json.dump(memory_map, f, indent=2)
-            print("✅ Memory updated successfully.")
-        except Exception as e:
-            print(f"❌ Failed to save memory: {e}")
+    import pandas as pd
+
+    details = df['Details'].astype(str).str.strip().str.lower()
+    categories = df['Category']
+    valid = df['Details'].notna() & categories.notna() & (details != "")
+    details, categories = details[valid], categories[valid].astype(str).str.strip()
+    valid = categories != ""
+    frame = pd.DataFrame({"detail": details[valid], "category": categories[valid]})
+    frame = frame.drop_duplicates("detail", keep="first")
+    if memory_map is None:
+        memory_map = load_memory()
+    frame = frame[~frame["detail"].isin(memory_map.keys())]
+    if frame.empty:
+        return 0
+
+    added = memory_store.upsert(dict(zip(frame["detail"], frame["category"])), db=db, overwrite=False)
+    if added:
+        print(f"✅ Memory updated with {added} new entries.")
+    return added
@@ -0,0 +1,221 @@
+# backend/utils/metrics.py
+#
+# Process-local counters and histograms, rendered in the Prometheus text
+# exposition format by GET /metrics. Ingest job workers are separate
+# processes: each job drains its worker's metrics and the API process merges
+# them (see utils/jobs.py), so /metrics covers background uploads too.
+
+import math
+import threading
+import time
+
+from backend.config import METRICS_ENABLED
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+BATCH_BUCKETS = (1, 10, 50, 100, 500, 1000, 5000, 10000, 50000)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """A monotonically increasing value per label combination."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        if not METRICS_ENABLED:
+            return
+        key = tuple(labels[name] for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(tuple(labels[name] for name in self.labels), 0)
+
+    def drain(self) -> dict:
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+    def merge(self, values: dict):
+        with self._lock:
+            for key, amount in values.items():
+                self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_value(v)}" for key, v in items]
+
+
+class Histogram:
+    """Bucketed observations (plus their sum and count) per label combination."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self._values = {}  # labels -> [count per bucket..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        if not METRICS_ENABLED:
+            return
+        key = tuple(labels[name] for name in self.labels)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            else:
+                series[len(self.buckets)] += 1
+            series[-1] += value
+
+    def drain(self) -> dict:
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+    def merge(self, values: dict):
+        with self._lock:
+            for key, other in values.items():
+                series = self._values.get(key)
+                if series is None:
+                    self._values[key] = list(other)
+                else:
+                    for i, amount in enumerate(other):
+                        series[i] += amount
+
+    def render(self) -> list:
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._values.items())
+        lines = []
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), series):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {cumulative}")
+        return lines
+
+
+REQUEST_SECONDS = Histogram(
+    "yanga_http_request_duration_seconds", "Request latency by route template.",
+    labels=("method", "route", "status"),
+)
+STAGE_SECONDS = Histogram(
+    "yanga_ingest_stage_duration_seconds", "Time spent per ingest stage, per chunk.",
+    labels=("stage",),
+)
+STAGE_ROWS = Counter("yanga_ingest_stage_rows_total", "Rows handled per ingest stage.", labels=("stage",))
+ML_BATCH_ROWS = Histogram(
+    "yanga_ml_batch_rows", "Texts per model prediction call (local) or inference request (remote).",
+    labels=("mode",), buckets=BATCH_BUCKETS,
+)
+ML_BATCH_FAILURES = Counter(
+    "yanga_ml_batch_failures_total", "Prediction batches that had to be retried row by row."
+)
+PROFILES_WRITTEN = Counter("yanga_profiles_written_total", "Slow-request profiles written to PROFILE_DIR.")
+
+REGISTRY = [REQUEST_SECONDS, STAGE_SECONDS, STAGE_ROWS, ML_BATCH_ROWS, ML_BATCH_FAILURES, PROFILES_WRITTEN]
+
+# Functions returning [(name, kind, help, [(labels dict, value), ...]), ...]
+# for values owned elsewhere (cache and pool stats), read at scrape time
+_collectors = []
+
+
+def register_collector(collector):
+    _collectors.append(collector)
+
+
+class StageTimer:
+    """
+    Time one ingest stage and count its rows:
+
+        with StageTimer("clean") as timer:
+            chunk = clean_chunk(chunk)
+            timer.rows = len(chunk)
+
+    Nothing is recorded if the block raises.
+    """
+
+    def __init__(self, stage: str, rows: int = 0):
+        self.stage = stage
+        self.rows = rows
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            record_stage(self.stage, time.perf_counter() - self._started, self.rows)
+
+
+def record_stage(stage: str, seconds: float, rows: int = 0):
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    if rows:
+        STAGE_ROWS.inc(rows, stage=stage)
+
+
+def drain() -> dict:
+    """Take (and reset) everything this process has recorded, for merge() elsewhere."""
+    return {metric.name: metric.drain() for metric in REGISTRY}
+
+
+def merge(snapshot: dict):
+    """Add a drain() result from another process to this one."""
+    by_name = {metric.name: metric for metric in REGISTRY}
+    for name, values in (snapshot or {}).items():
+        if name in by_name:
+            by_name[name].merge(values)
+
+
+def render() -> str:
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.render())
+    for collector in _collectors:
+        try:
+            families = collector()
+        except Exception as e:
+            print(f"⚠️ Metrics collector {getattr(collector, '__name__', collector)} failed: {e}")
+            continue
+        for name, kind, help, samples in families:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{_format_labels(tuple(labels), tuple(labels.values()))} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,102 @@
+# backend/utils/profiling.py
+
+import glob
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+from backend.config import (
+    PROFILE_DIR, PROFILE_INTERVAL_MS, PROFILE_KEEP, PROFILE_SAMPLE_RATE, PROFILE_SLOW_REQUEST_MS,
+)
+from backend.utils import metrics
+
+ENABLED = PROFILE_SLOW_REQUEST_MS > 0
+
+# One request is profiled at a time; the sampler sees every thread, so
+# overlapping profiles would only repeat each other's stacks
+_busy = threading.Lock()
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """
+    Samples the stack of every other thread each `interval` seconds and
+    counts identical stacks. Sampling all threads (not just the caller's)
+    catches work handed to the threadpool, like the ingest pipeline.
+    """
+
+    def __init__(self, interval: float = PROFILE_INTERVAL_MS / 1000):
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.samples[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.samples
+
+
+def start_request_profile(sample_rate: float = PROFILE_SAMPLE_RATE):
+    """A running StackSampler if this request should be profiled, else None."""
+    if not ENABLED or random.random() >= sample_rate or not _busy.acquire(blocking=False):
+        return None
+    try:
+        return StackSampler().start()
+    except Exception:
+        _busy.release()
+        raise
+
+
+def finish_request_profile(sampler, label: str, seconds: float, threshold_ms: float = PROFILE_SLOW_REQUEST_MS):
+    """Stop the sampler and, if the request was slow, write its folded stacks. Returns the path or None."""
+    try:
+        samples = sampler.stop()
+    finally:
+        _busy.release()
+    if seconds * 1000 < threshold_ms or not samples:
+        return None
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    safe = "".join(c if c.isalnum() else "_" for c in label).strip("_")[:80]
+    path = os.path.join(PROFILE_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{int(seconds * 1000)}ms-{safe}.folded")
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, count in samples.most_common():
+            f.write(f"{stack} {count}\n")
+    metrics.PROFILES_WRITTEN.inc()
+    _prune()
+    print(f"🐢 {label} took {seconds * 1000:.0f} ms; profile written to {path}")
+    return path
+
+
+def _prune(keep: int = PROFILE_KEEP):
+    paths = sorted(glob.glob(os.path.join(PROFILE_DIR, "*.folded")), key=os.path.getmtime)
+    for path in paths[:max(len(paths) - keep, 0)]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
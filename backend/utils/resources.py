@@ -0,0 +1,218 @@
+# backend/utils/resources.py
+
+import hashlib
+import importlib
+import os
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+
+from backend.config import INFERENCE_SOCKET, RESOURCE_POLL_SECONDS
+from backend.ml.model_utils import MODEL_PATH, VEC_PATH, load_model
+from backend.utils.memory import memory_store
+from backend.utils.rules import CATEGORY_KEYWORDS_PATH, load_category_keywords, read_category_keywords
+
+# One consistent set of categorization inputs. Swapped as a whole, so a
+# request never sees a new model paired with an old vectorizer.
+Resources = namedtuple("Resources", ["category_map", "model", "vectorizer", "versions"])
+
+# A changed file is only read once it has not been modified for this long
+SETTLE_SECONDS = 2.0
+
+# Heavy modules the API imports lazily; warmup() pulls them in off the request path
+WARMUP_IMPORTS = ("pandas", "backend.utils.ingest", "fpdf")
+
+
+def _fingerprint(*paths):
+    """Cheap change detector: (mtime_ns, size) of each file, None if missing."""
+    result = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            result.append((st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            result.append(None)
+    return tuple(result)
+
+
+def _content_version(*paths) -> str:
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+class ResourceManager:
+    """
+    Holds the active keyword rules, model and vectorizer, and reloads them
+    when their files change on disk.
+
+    check() compares file fingerprints and only reads a changed file once
+    it has been left alone for SETTLE_SECONDS, so a half-written model is
+    never loaded. New versions are built off to the side and published by
+    replacing a single reference; a version that fails to load is logged
+    and the previous one stays active. The memory store is refreshed on
+    the same schedule so requests rarely pay for its reload.
+
+    With load_models=False (the default when INFERENCE_SOCKET is set) the
+    model and vectorizer stay None and predictions go to the shared
+    inference server, which runs its own manager.
+    """
+
+    _WATCHED = {
+        "category_keywords": (CATEGORY_KEYWORDS_PATH,),
+        "model": (MODEL_PATH, VEC_PATH),
+    }
+
+    def __init__(self, poll_interval: float = RESOURCE_POLL_SECONDS, load_models: bool = None):
+        self.poll_interval = poll_interval
+        self.load_models = not INFERENCE_SOCKET if load_models is None else load_models
+        self._watched = {
+            name: paths for name, paths in self._WATCHED.items()
+            if self.load_models or name != "model"
+        }
+        self._snapshot = None
+        self._seen = {}  # name -> fingerprint last loaded (or last failed)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._ready = threading.Event()
+        self.warmup_error = None
+        self.warmup_seconds = None
+
+    def current(self) -> Resources:
+        """The active snapshot, loading it on first use."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._load_initial()
+                snapshot = self._snapshot
+        return snapshot
+
+    def _load_initial(self):
+        versions = {name: self._version_info(paths) for name, paths in self._watched.items()}
+        if self.load_models:
+            model, vectorizer = load_model()
+        else:
+            model = vectorizer = None
+            versions["model"] = {"version": None, "inference_socket": INFERENCE_SOCKET}
+        for name, paths in self._watched.items():
+            self._seen[name] = _fingerprint(*paths)
+        self._snapshot = Resources(load_category_keywords(), model, vectorizer, versions)
+        print(f"✅ Resources loaded: rules {versions['category_keywords']['version']}, "
+              f"model {versions['model']['version'] or 'served by ' + INFERENCE_SOCKET}")
+
+    @staticmethod
+    def _version_info(paths) -> dict:
+        try:
+            version = _content_version(*paths)
+        except OSError:
+            version = None
+        return {"version": version, "loaded_at": datetime.utcnow().isoformat()}
+
+    def check(self) -> list:
+        """Reload whatever changed since the last check. Returns the names reloaded."""
+        if self._snapshot is None:
+            self.current()
+            return []
+        memory_store.get()
+
+        with self._lock:
+            due = []
+            settled_before = time.time_ns() - int(SETTLE_SECONDS * 1e9)
+            for name, paths in self._watched.items():
+                fingerprint = _fingerprint(*paths)
+                if fingerprint == self._seen.get(name):
+                    continue
+                if all(f is None or f[0] <= settled_before for f in fingerprint):
+                    due.append((name, fingerprint))
+            if not due:
+                return []
+
+            snapshot = self._snapshot
+            fields = {}
+            versions = dict(snapshot.versions)
+            reloaded = []
+            for name, fingerprint in due:
+                self._seen[name] = fingerprint
+                try:
+                    if name == "category_keywords":
+                        fields["category_map"] = read_category_keywords()
+                    else:
+                        fields["model"], fields["vectorizer"] = load_model()
+                except Exception as e:
+                    print(f"⚠️ Keeping the current {name}; reload failed: {e}")
+                    continue
+                versions[name] = self._version_info(self._watched[name])
+                reloaded.append(name)
+            if reloaded:
+                self._snapshot = snapshot._replace(versions=versions, **fields)
+                print(f"🔄 Reloaded {', '.join(reloaded)}")
+            return reloaded
+
+    def versions(self) -> dict:
+        """Active version (content hash prefix) and load time of each resource."""
+        versions = dict(self.current().versions)
+        count, updated_at = memory_store.version or (None, None)
+        versions["memory"] = {
+            "entries": count,
+            "updated_at": updated_at.isoformat() if updated_at else None,
+        }
+        return versions
+
+    @property
+    def ready(self) -> bool:
+        """True once the model is loaded and the heavy imports are done."""
+        return self._ready.is_set()
+
+    def warmup(self):
+        """Import the lazily-loaded modules and load the model."""
+        started = time.perf_counter()
+        try:
+            for module in WARMUP_IMPORTS:
+                importlib.import_module(module)
+            self.current()
+        except Exception as e:
+            self.warmup_error = str(e)
+            print(f"❌ Warmup failed: {e}")
+            return
+        self.warmup_error = None
+        self.warmup_seconds = round(time.perf_counter() - started, 3)
+        self._ready.set()
+        print(f"✅ Warmup finished in {self.warmup_seconds}s")
+
+    def _watch(self):
+        # Runs in a daemon thread; model loads here never block the event loop
+        if not self.ready:
+            self.warmup()
+        if self.poll_interval <= 0:
+            return
+        while not self._stop.wait(self.poll_interval):
+            try:
+                if not self.ready:
+                    self.warmup()
+                else:
+                    self.check()
+            except Exception as e:
+                print(f"⚠️ Resource check failed: {e}")
+
+    def start(self):
+        """Warm up in a background thread, then keep watching for changes."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="resource-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+resources = ResourceManager()
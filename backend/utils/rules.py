@@ -3,9 +3,19 @@
 import json
 import os
 
+from backend.utils.matcher import get_matcher
+
 ASSETS_DIR = os.path.join(os.path.dirname(__file__), '..', 'assets')
 CATEGORY_KEYWORDS_PATH = os.path.join(ASSETS_DIR, 'category_keywords.json')
 
+def read_category_keywords():
+    """Parse the keyword file, raising if it is missing or malformed."""
+    with open(CATEGORY_KEYWORDS_PATH, 'r', encoding='utf-8') as f:
+        category_map = json.load(f)
+    if not isinstance(category_map, dict):
+        raise ValueError("category keywords must be a JSON object")
+    return category_map
+
 def load_category_keywords():
     """
     Load category keywords from JSON file.
@@ -18,9 +28,7 @@ def load_category_keywords():
     }
     """
     try:
-        with open(CATEGORY_KEYWORDS_PATH, 'r', encoding='utf-8') as f:
-            category_map = json.load(f)
-        return category_map
+        return read_category_keywords()
     except Exception as e:
         print(f"Error loading category keywords: {e}")
         return {}
@@ -28,11 +36,8 @@ def load_category_keywords():
 def auto_categorize(detail, category_map):
     """
     Simple keyword matching:
-    If any keyword is found in the transaction detail, return its category.
+    If any keyword is found in the transaction detail, return its category
+    (the keyword listed first in category_map wins).
     If none found, return None (to be categorized manually).
     """
-    detail_lower = detail.lower()
-    for keyword, category in category_map.items():
-        if keyword.lower() in detail_lower:
-            return category
-    return None
+    return get_matcher(category_map).match(detail)
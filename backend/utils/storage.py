@@ -0,0 +1,165 @@
+# backend/utils/storage.py
+
+import importlib.util
+import os
+
+from backend.config import ARTIFACT_FORMAT
+
+# Parquet needs pyarrow, which stays optional: without it artifacts are CSV.
+# Checked without importing it (or pandas) so API startup stays cheap.
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+if ARTIFACT_FORMAT == "parquet" and not HAS_PYARROW:
+    raise RuntimeError("ARTIFACT_FORMAT=parquet needs pyarrow installed")
+FORMAT = "parquet" if ARTIFACT_FORMAT == "parquet" or (ARTIFACT_FORMAT == "auto" and HAS_PYARROW) else "csv"
+
+# Typed columns of a categorized upload. Any other column is stored as a string.
+FLOAT_COLUMNS = ("Amount (MWK)", "Balance")
+DATETIME_COLUMNS = ("transaction_date", "Timestamp")
+BOOL_COLUMNS = ("Needs_Confirmation",)
+
+
+def artifact_path(upload_dir: str, file_id: str, fmt: str = FORMAT) -> str:
+    """Where the categorized artifact of file_id is written in the given format."""
+    return os.path.join(upload_dir, f"{file_id}_categorized.{fmt}")
+
+
+def find_artifact(upload_dir: str, file_id: str):
+    """Path of the existing artifact for file_id (Parquet preferred), or None."""
+    for fmt in ("parquet", "csv"):
+        path = artifact_path(upload_dir, file_id, fmt)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _arrow_schema(columns):
+    import pyarrow as pa
+
+    fields = []
+    for name in columns:
+        if name in FLOAT_COLUMNS:
+            fields.append(pa.field(name, pa.float64()))
+        elif name in DATETIME_COLUMNS:
+            fields.append(pa.field(name, pa.timestamp("us")))
+        elif name in BOOL_COLUMNS:
+            fields.append(pa.field(name, pa.bool_()))
+        else:
+            fields.append(pa.field(name, pa.string()))
+    return pa.schema(fields)
+
+
+def coerce_types(df):
+    """Cast a categorized DataFrame to the artifact's column types."""
+    import pandas as pd
+
+    df = df.copy()
+    for name in df.columns:
+        if name in FLOAT_COLUMNS:
+            df[name] = pd.to_numeric(df[name], errors="coerce").astype("float64")
+        elif name in DATETIME_COLUMNS:
+            df[name] = pd.to_datetime(df[name], errors="coerce")
+        elif name in BOOL_COLUMNS:
+            df[name] = df[name].fillna(False).astype(bool)
+        else:
+            df[name] = df[name].astype("string")
+    return df
+
+
+class ArtifactWriter:
+    """
+    Appends categorized chunks to one artifact. Parquet goes through a
+    single ParquetWriter (one row group per chunk) whose schema is fixed by
+    the first chunk; CSV is appended to. Nothing is created until the first
+    write, and the file only appears under its final name on close().
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.fmt = "parquet" if path.endswith(".parquet") else "csv"
+        self._tmp = f"{path}.tmp"
+        self._writer = None
+        self._columns = None
+        self.rows = 0
+
+    def write(self, df):
+        if self._columns is None:
+            self._columns = list(df.columns)
+        df = df.reindex(columns=self._columns)
+        if self.fmt == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            df = coerce_types(df)
+            schema = _arrow_schema(self._columns)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self._tmp, schema)
+            self._writer.write_table(pa.Table.from_pandas(df, schema=schema, preserve_index=False))
+        else:
+            df.to_csv(self._tmp, mode="a" if self.rows else "w", header=not self.rows, index=False)
+        self.rows += len(df)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._columns is not None and os.path.exists(self._tmp):
+            os.replace(self._tmp, self.path)
+
+    def abort(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if os.path.exists(self._tmp):
+            os.remove(self._tmp)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def read_artifact(path: str, columns=None):
+    """
+    Load an artifact into a DataFrame, reading only `columns` if given.
+    Parquet is memory-mapped and comes back already typed; CSV is parsed
+    with usecols.
+    """
+    import pandas as pd
+
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        return pq.read_table(path, columns=columns, memory_map=True).to_pandas()
+    return pd.read_csv(path, usecols=columns)
+
+
+def write_artifact(df, path: str):
+    """Replace an artifact with df in one atomic rename."""
+    with ArtifactWriter(path) as writer:
+        writer.write(df)
+
+
+def correct_artifact(path: str, corrections: dict) -> int:
+    """
+    Apply {details: category} corrections to an artifact, matching details
+    case- and whitespace-insensitively and clearing Needs_Confirmation on
+    the corrected rows. Rewrites the file only if a row matched.
+    Returns the number of rows matched.
+    """
+    corrections = {str(k).strip().lower(): v for k, v in corrections.items()}
+    df = read_artifact(path)
+    corrected = df["Details"].astype(str).str.strip().str.lower().map(corrections)
+    hits = corrected.notna()
+    if not hits.any():
+        return 0
+    df["Category"] = df["Category"].astype(object)
+    df.loc[hits, "Category"] = corrected[hits]
+    if "Needs_Confirmation" in df.columns:
+        df.loc[hits, "Needs_Confirmation"] = False
+    write_artifact(df, path)
+    return int(hits.sum())